@@ -108,6 +108,11 @@ WSGI_APPLICATION = "api.wsgi.application"
 DATABASES = {"default": env.db()}
 
 
+# Cache
+# https://django-environ.readthedocs.io/en/latest/types.html#environ-env-cache-url
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+
+
 # AUTHENTICATION_BACKENDS = [
 #     # Needed to login by username in Django admin, regardless of `allauth`
 #     "django.contrib.auth.backends.ModelBackend",
@@ -189,7 +194,7 @@ REST_FRAMEWORK = {
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_THROTTLE_CLASSES": ("rest_framework.throttling.AnonRateThrottle",),
-    "DEFAULT_THROTTLE_RATES": {"anon": "200/hour"},
+    "DEFAULT_THROTTLE_RATES": {"anon": "200/hour", "post_export": "30/hour"},
     "PAGE_SIZE": 25,
     "UPLOADED_FILES_USE_URL": True,
 }
@@ -244,3 +249,36 @@ USERNAME_CHANGE_ALLOWED_AFTER = env.int(
 
 if USERNAME_CHANGE_ALLOWED_AFTER <= 1:
     USERNAME_CHANGE_ALLOWED_AFTER = 14
+
+
+# Rows each post / comment spreads its pending vote counts over
+VOTE_COUNTER_SHARDS = env.int("VOTE_COUNTER_SHARDS", default=8)
+
+# Buffer votes and apply them in batches with the `flush_vote_buffer` command.
+# Only enable where that command runs, buffered votes aren't applied otherwise
+VOTE_WRITE_BEHIND = env.bool("VOTE_WRITE_BEHIND", default=False)
+
+# Home feed timelines keep this many newest posts per user
+FEED_TIMELINE_LENGTH = env.int("FEED_TIMELINE_LENGTH", default=500)
+
+# Posts of subreddits with more members aren't fanned out, feeds merge them
+# in on read instead
+FEED_FAN_OUT_MAX_MEMBERS = env.int("FEED_FAN_OUT_MAX_MEMBERS", default=10000)
+
+# Newest posts cached per subreddit for feeds merged on read
+FEED_RECENT_POSTS = env.int("FEED_RECENT_POSTS", default=1000)
+
+# Build the subscribed feed from fanned out timelines, or only by merging
+# the subreddits' recent posts on read. Only enable where the
+# `fan_out_feeds` worker runs, timelines stay empty otherwise
+FEED_FAN_OUT = env.bool("FEED_FAN_OUT", default=False)
+
+# Page number pagination estimates `count` above this many rows
+PAGINATION_EXACT_COUNT_LIMIT = env.int(
+    "PAGINATION_EXACT_COUNT_LIMIT", default=10000
+)
+# Seconds an estimated count is cached for on databases without a planner
+# estimate (anything but PostgreSQL)
+PAGINATION_COUNT_CACHE_TIMEOUT = env.int(
+    "PAGINATION_COUNT_CACHE_TIMEOUT", default=300
+)
@@ -18,3 +18,25 @@ FEED_TYPES = Choices(
     ("popular", "Popular"),
     ("all", "All"),
 )
+
+
+COMMENT_SORT_TYPES = Choices(
+    ("new", "New"),
+    ("old", "Old"),
+)
+
+
+VOTE_TYPES = Choices(
+    (1, "up", _("Upvote")),
+    (-1, "down", _("Downvote")),
+)
+
+
+FEED_ORDERINGS = Choices(
+    ("new", "New"),
+    ("best", "Best"),
+    ("hot", "Hot"),
+    ("rising", "Rising"),
+    ("controversial", "Controversial"),
+    ("random", "Random"),
+)
@@ -28,3 +28,75 @@ class PostType:
     @classmethod
     def values(self) -> list[str]:
         return [self.TEXT, self.IMAGE, self.LINK, self.VIDEO]
+
+
+class CommentTreeConstants:
+    # Every comment appends its zero padded hex id to its parent's path, so
+    # a subtree is a contiguous range of `path` values within a post.
+    PATH_STEP = 16
+
+    # Limits applied when a thread is rendered as a nested tree
+    DEFAULT_DEPTH = 8
+    MAX_DEPTH = 16
+    DEFAULT_LIMIT = 20
+    MAX_LIMIT = 100
+
+    # Rows fetched per round trip when a thread is streamed out
+    EXPORT_CHUNK_SIZE = 2000
+
+
+class FeedConstants:
+    # Cache key of the newest `(created, id, post_type)` of a subreddit
+    RECENT_POSTS_CACHE_KEY = "post:recent:{}"
+    # Bounds how long posts deleted in bulk (no hooks) linger in the cache
+    RECENT_POSTS_TIMEOUT = 60 * 10
+
+
+class SubscriptionConstants:
+    # Cache key of a user's joined subreddit ids, a sorted `array` of ints
+    SUBSCRIPTIONS_CACHE_KEY = "subreddit:subscriptions:{}"
+    # Bounds how long memberships deleted in bulk (no hooks) linger
+    SUBSCRIPTIONS_TIMEOUT = 60 * 60
+
+
+class ModerationConstants:
+    # Cache keys of a subreddit's moderator ids and its bans, a dict of user
+    # id to `banned_until` (None for permanent bans)
+    MODERATORS_CACHE_KEY = "subreddit:moderators:{}"
+    BANS_CACHE_KEY = "subreddit:bans:{}"
+    CACHE_TIMEOUT = 60 * 60
+
+    # Entries also kept in each process, and for how many seconds. Changes
+    # made by other processes show up once the local entry expires.
+    LOCAL_CACHE_SIZE = 1024
+    LOCAL_CACHE_TTL = 5
+
+
+class TrendingConstants:
+    # Engagement is counted per post in slices of this many minutes, and
+    # the popular lists only look at the slices of the last `WINDOW_HOURS`
+    BUCKET_MINUTES = 10
+    WINDOW_HOURS = 24
+
+    # Weight of each kind of engagement in the trending score
+    VIEW_WEIGHT = 1
+    VOTE_WEIGHT = 5
+    COMMENT_WEIGHT = 10
+
+    GLOBAL_TOP = 500
+    SUBREDDIT_TOP = 100
+
+    # Cache keys of the `(id, post_type)` lists, best first
+    GLOBAL_CACHE_KEY = "post:popular"
+    SUBREDDIT_CACHE_KEY = "post:popular:{}"
+    # Subreddits that currently have a cached list
+    SUBREDDITS_CACHE_KEY = "post:popular-subreddits"
+    CACHE_TIMEOUT = 60 * 60
+
+    # Views are counted in the cache per slice and post, and folded into
+    # the slices by `refresh_popular`. The posts viewed in a slice are listed
+    # under numbered keys, the count of which is kept under its own key.
+    VIEW_COUNT_CACHE_KEY = "post:views:{}:{}"
+    VIEWED_POSTS_CACHE_KEY = "post:viewed:{}"
+    VIEWED_POST_CACHE_KEY = "post:viewed:{}:{}"
+    VIEWS_TIMEOUT = (WINDOW_HOURS + 1) * 60 * 60
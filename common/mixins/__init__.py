@@ -1,14 +1,24 @@
 from .multiple_lookup_field_mixin import MultipleLookupFieldMixin
+from .pagination_action_class_mixin import PaginationActionClassMixin
 from .permission_action_class_mixin import PermissionActionClassMixin
+from .preload_serializer_mixin import PreloadSerializerMixin
 from .serializer_action_class_mixin import SerializerActionClassMixin
 from .serializer_create_update_only_mixin import SerializerCreateUpdateOnlyMixin
+from .sparse_fields_mixin import SparseFieldsMixin
+from .subreddit_context_mixin import SubredditContextMixin
+from .values_response_mixin import ValuesResponseMixin
 from .viewset_mixins import NonDestructiveModelViewSet, NonListingModelViewSet
 
 __all__ = (
     "MultipleLookupFieldMixin",
+    "PaginationActionClassMixin",
     "PermissionActionClassMixin",
+    "PreloadSerializerMixin",
     "SerializerActionClassMixin",
     "SerializerCreateUpdateOnlyMixin",
+    "SparseFieldsMixin",
+    "SubredditContextMixin",
+    "ValuesResponseMixin",
     "NonDestructiveModelViewSet",
     "NonListingModelViewSet",
 )
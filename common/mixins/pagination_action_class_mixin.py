@@ -0,0 +1,51 @@
+from typing import Any
+
+
+class PaginationActionClassMixin:
+    """
+    A class which inherits this mixin can have attributes
+    `pagination_action_classes` and `pagination_choices`.
+
+    `pagination_action_classes` should be a dict mapping action name (key)
+    to pagination class (value). `pagination_choices` maps a name to a
+    pagination class clients can ask for with `?pagination=<name>`, i.e.:
+
+    ```
+    class SampleViewSet(viewsets.ModelViewSet):
+        pagination_class = CustomPageNumberPagination
+        pagination_action_classes = {
+            "list": KeysetPagination,
+        }
+        pagination_choices = {
+            "cursor": KeysetPagination,
+            "page": EstimatedCountPageNumberPagination,
+        }
+    ```
+
+    If there's no entry for that action then just fallback to the regular
+    `pagination_class`.
+    """
+
+    pagination_action_classes: dict[str, Any] = {}
+    pagination_choices: dict[str, Any] = {}
+    pagination_query_param = "pagination"
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            self._paginator = None
+            pagination_class = self.get_pagination_class()
+            if pagination_class is not None:
+                self._paginator = pagination_class()
+        return self._paginator
+
+    def get_pagination_class(self):
+        request = getattr(self, "request", None)
+        if request is not None:
+            choice = request.query_params.get(self.pagination_query_param)
+            if choice in self.pagination_choices:
+                return self.pagination_choices[choice]
+
+        return self.pagination_action_classes.get(
+            getattr(self, "action", None), self.pagination_class
+        )
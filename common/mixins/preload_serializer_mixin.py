@@ -0,0 +1,23 @@
+from rest_framework.permissions import SAFE_METHODS
+
+from core.preload import preload
+
+
+class PreloadSerializerMixin:
+    """
+    Loads what the action's serializer renders along with the queryset:
+    nested and `source=` relations through `select_related` or
+    `prefetch_related`, and only the columns rendered.
+
+    Applied to the querysets of safe (read) requests in `filter_queryset`.
+    Actions building their own queryset call `self.preload(queryset)`.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method in SAFE_METHODS:
+            queryset = self.preload(queryset)
+        return queryset
+
+    def preload(self, queryset):
+        return preload(queryset, self.get_serializer())
@@ -0,0 +1,113 @@
+from django.core.exceptions import FieldDoesNotExist
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+from core.preload import get_serializer_fields
+from core.serializers import DynamicFieldsModelSerializer
+
+
+class SparseFieldsMixin:
+    """
+    Lets clients pick the fields of read responses with `?fields=` or leave
+    fields out with `?omit=`, both comma separated, i.e.
+    `?fields=slug,title` or `?omit=body`.
+
+    The fields are passed on to the action's serializer when it is a
+    `DynamicFieldsModelSerializer`. The columns of fields left out aren't
+    loaded either: `PreloadSerializerMixin` only selects what the serializer
+    renders, and `filter_queryset` defers the rest.
+    """
+
+    fields_query_param = "fields"
+    omit_query_param = "omit"
+
+    def get_query_param_list(self, name: str) -> list[str] | None:
+        value = self.request.query_params.get(name, "")
+        return [field for field in value.split(",") if field] or None
+
+    def get_sparse_fields(self) -> tuple[list[str] | None, list[str]]:
+        """Requested `fields` (`None` for all of them) and `omit`"""
+
+        request = getattr(self, "request", None)
+        if request is None or request.method not in SAFE_METHODS:
+            return None, []
+        fields = self.get_query_param_list(self.fields_query_param)
+        omit = self.get_query_param_list(self.omit_query_param) or []
+        return fields, omit
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        fields, omit = self.get_sparse_fields()
+        if fields is None and not omit:
+            return serializer
+
+        child = getattr(serializer, "child", serializer)
+        if not isinstance(child, DynamicFieldsModelSerializer):
+            return serializer
+        available = get_serializer_fields(serializer)
+
+        unknown = {*(fields or ()), *omit} - set(available)
+        if unknown:
+            raise ValidationError(
+                detail={
+                    "message": "Unknown fields: {}.".format(
+                        ", ".join(sorted(unknown))
+                    )
+                }
+            )
+
+        kwargs["fields"] = [
+            name
+            for name in available
+            if (fields is None or name in fields) and name not in omit
+        ]
+        # Left for `filter_queryset` to defer their columns
+        self._omitted_fields = {
+            name: field
+            for name, field in available.items()
+            if name not in kwargs["fields"]
+        }
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields, omit = self.get_sparse_fields()
+        if fields is None and not omit:
+            return queryset
+
+        self._omitted_fields = {}
+        self.get_serializer()
+        deferred = self.get_deferred_fields(queryset, self._omitted_fields)
+        if deferred:
+            queryset = queryset.defer(*deferred)
+        return queryset
+
+    @staticmethod
+    def get_deferred_fields(queryset, omitted: dict) -> list[str]:
+        """Columns rendered only by the `omitted` fields"""
+
+        model = queryset.model
+        # Keyset pagination reads the ordering columns of every row
+        ordering = {
+            name.lstrip("-")
+            for name in queryset.query.order_by or model._meta.ordering
+            if isinstance(name, str)
+        }
+
+        deferred = []
+        for field in omitted.values():
+            if len(field.source_attrs) != 1:
+                continue
+            try:
+                model_field = model._meta.get_field(field.source_attrs[0])
+            except FieldDoesNotExist:
+                continue
+            if (
+                model_field.concrete
+                and not model_field.is_relation
+                and not model_field.primary_key
+                and model_field.name not in ordering
+            ):
+                deferred.append(model_field.name)
+        return deferred
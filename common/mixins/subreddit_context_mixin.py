@@ -0,0 +1,25 @@
+from django.http import Http404
+
+from subreddit.context import SubredditContext, get_subreddit_context
+from subreddit.models import Subreddit
+
+
+class SubredditContextMixin:
+    """
+    Gives a view the subreddit of its URL and the user's status in it,
+    resolved once per request and shared with the permission classes.
+
+    `subreddit_url_kwarg` names the URL kwarg holding the subreddit name,
+    i.e. `"name"` on the subreddit routes themselves.
+    """
+
+    subreddit_url_kwarg = "subreddit_name"
+
+    def get_subreddit_context(self) -> SubredditContext:
+        return get_subreddit_context(self.request, self)
+
+    def get_subreddit(self) -> Subreddit:
+        subreddit = self.get_subreddit_context().subreddit
+        if subreddit is None:
+            raise Http404
+        return subreddit
@@ -0,0 +1,34 @@
+from rest_framework.response import Response
+
+from core.values import ValuesSerializer
+
+
+class ValuesResponseMixin:
+    """
+    Renders list responses from `.values()` rows with a `ValuesSerializer`
+    of the action's serializer, skipping model instances and the
+    serializer's per field `to_representation`. The data is the same as the
+    serializer's, i.e.:
+
+    ```
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.values_response(queryset)
+    ```
+
+    Only serializers whose fields are plain columns can be rendered so.
+    """
+
+    def get_values_serializer(self) -> ValuesSerializer:
+        return ValuesSerializer.for_serializer(self.get_serializer())
+
+    def values_response(self, queryset) -> Response:
+        """Paginated response of `queryset` rendered from values"""
+
+        values_serializer = self.get_values_serializer()
+        rows = values_serializer.values(queryset)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(values_serializer.render(page))
+        return Response(values_serializer.render(rows))
@@ -1,17 +1,14 @@
-from django.utils import timezone
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 
 from post.models import Comment
-from subreddit.models import BannedUser, SubredditUser
+from subreddit.context import get_subreddit_context
 from users.models.user import User
 
 
 class IsSubredditOwnerOrModerator(IsAuthenticatedOrReadOnly):
     def has_object_permission(self, request, view, obj):
         if super().has_object_permission(request, view, obj):
-            return request.user.id in obj.moderators.select_related(
-                "user"
-            ).values_list("user__id", flat=True)
+            return get_subreddit_context(request, view).is_moderator
         return False
 
 
@@ -20,16 +17,7 @@ class IsSubredditMember(IsAuthenticatedOrReadOnly):
 
     def has_permission(self, request, view):
         if super().has_permission(request, view):
-            subreddit = request.path.rsplit("/api/r/")[-1].split("/")[0]
-
-            if not subreddit:
-                return False
-
-            return bool(
-                SubredditUser.objects.filter(
-                    user=request.user, subreddit__name=subreddit
-                ).exists()
-            )
+            return get_subreddit_context(request, view).is_member
 
         return False
 
@@ -47,13 +35,25 @@ class IsPostLocked(IsAuthenticatedOrReadOnly):
 class IsCommentLocked(IsAuthenticatedOrReadOnly):
     message = "Comment thread is locked"
 
+    def has_permission(self, request, view):
+        if super().has_permission(request, view):
+            if request.method != "POST":
+                return True
+
+            # Replies are checked against the thread of their parent
+            try:
+                parent = int(request.data.get("parent") or 0)
+            except (TypeError, ValueError):
+                return True
+
+            if not parent:
+                return True
+            return bool(not Comment.objects.is_thread_locked(parent))
+        return False
+
     def has_object_permission(self, request, view, obj):
         if super().has_object_permission(request, view, obj):
-            parents = obj.get_all_parents()
-            is_thread_locked = Comment.objects.filter(
-                id__in=parents, locked=True
-            ).exists()
-            return bool(not is_thread_locked)
+            return bool(not obj.thread_locked)
         return False
 
 
@@ -76,20 +76,12 @@ class IsUserBanned(IsAuthenticatedOrReadOnly):
 
     def has_permission(self, request, view):
         if super().has_permission(request, view):
-            subreddit = request.path.rsplit("/api/r/")[-1].split("/")[0]
-
-            if not subreddit:
-                return False
-
-            banned_user = BannedUser.objects.filter(
-                user=request.user, subreddit__name=subreddit
-            ).first()
-            if banned_user and banned_user.banned_until > timezone.now():
-                return False
-            return True
+            context = get_subreddit_context(request, view)
+            return not context.is_banned
         return False
 
     def has_object_permission(self, request, view, obj):
         if super().has_object_permission(request, view, obj):
-            return bool(not obj.banned_users.filter(user=request.user).exists())
+            context = get_subreddit_context(request, view)
+            return not context.is_banned
         return False
@@ -1,7 +1,16 @@
+import os
+import threading
+import time
 import uuid
 
 from django.utils import timezone
 
+# Snowflake ids: milliseconds since `SNOWFLAKE_EPOCH` in the high bits, then
+# 10 bits of process id and a 12 bit sequence for ids of the same millisecond
+SNOWFLAKE_EPOCH = 1672531200000  # 2023-01-01 UTC
+_snowflake_lock = threading.Lock()
+_snowflake_last = [0, 0]  # millisecond, sequence
+
 
 def get_default_subreddit_image_path() -> str:
     return f"subreddit/default_image.png"
@@ -38,3 +47,37 @@ def get_avatar_path(instance, filename, **kwargs) -> str:
 
 def get_timedelta(days=14) -> timezone.timedelta:
     return timezone.timedelta(days=days)
+
+
+def get_snowflake_id() -> int:
+    """Roughly time ordered id, unique within a process without any I/O"""
+
+    with _snowflake_lock:
+        now = time.time_ns() // 1_000_000 - SNOWFLAKE_EPOCH
+        last, sequence = _snowflake_last
+        if now > last:
+            sequence = 0
+        else:
+            # Same millisecond or the clock went back, keep counting from last
+            now, sequence = last, (sequence + 1) & 0xFFF
+            if sequence == 0:
+                now += 1
+        _snowflake_last[:] = now, sequence
+
+    return now << 22 | (os.getpid() & 0x3FF) << 12 | sequence
+
+
+def to_base36(number: int) -> str:
+    digits = "0123456789abcdefghijklmnopqrstuvwxyz"
+    encoded = ""
+    while True:
+        number, remainder = divmod(number, 36)
+        encoded = digits[remainder] + encoded
+        if not number:
+            return encoded
+
+
+def make_unique_slug(slug: str) -> str:
+    """`slug` with a short suffix derived from a snowflake id"""
+
+    return f"{slug}_{to_base36(get_snowflake_id())}"
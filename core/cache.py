@@ -0,0 +1,85 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+from django.core.cache import cache
+
+MISSING = object()
+
+
+class LocalCache:
+    """
+    In-process LRU cache whose entries expire `ttl` seconds after being set.
+    Each process has its own, so entries dropped in one process linger in
+    the others for at most `ttl` seconds.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class TwoLevelCache:
+    """
+    `LocalCache` in front of the shared Django cache, for values identified
+    by an id and stored under `key_format.format(id)`. Misses on both levels
+    are filled by `load(id)`, and `delete(id)` drops the value from both.
+    """
+
+    def __init__(
+        self,
+        key_format: str,
+        load: Callable[[Any], Any],
+        maxsize: int,
+        ttl: float,
+        timeout: int,
+    ):
+        self.key_format = key_format
+        self.load = load
+        self.local = LocalCache(maxsize=maxsize, ttl=ttl)
+        self.timeout = timeout
+
+    def get(self, id):
+        key = self.key_format.format(id)
+        value = self.local.get(key, MISSING)
+        if value is MISSING:
+            value = cache.get(key, MISSING)
+            if value is MISSING:
+                value = self.load(id)
+                cache.set(key, value, timeout=self.timeout)
+            self.local.set(key, value)
+        return value
+
+    def delete(self, id) -> None:
+        key = self.key_format.format(id)
+        self.local.delete(key)
+        cache.delete(key)
@@ -0,0 +1,37 @@
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Error, Tags, Warning, register
+
+# Backends whose entries are only seen by the process that wrote them
+PROCESS_LOCAL_BACKENDS = (DummyCache, LocMemCache)
+
+
+def is_cache_shared() -> bool:
+    return not isinstance(caches["default"], PROCESS_LOCAL_BACKENDS)
+
+
+def register_shared_cache_check(app_label: str, number: int, feature: str):
+    """
+    Check that `feature`, kept in the default cache, doesn't get a separate
+    cache per process. Warns, and fails `check --deploy`.
+    """
+
+    msg = (
+        f"The default cache is local to each process, {feature} kept in it "
+        "aren't shared between processes."
+    )
+    hint = "Set `CACHE_URL` to a shared cache, i.e. Redis or Memcached."
+
+    def check(app_configs, **kwargs):
+        if is_cache_shared():
+            return []
+        return [Warning(msg, hint=hint, id=f"{app_label}.W{number:03}")]
+
+    def deploy_check(app_configs, **kwargs):
+        if is_cache_shared():
+            return []
+        return [Error(msg, hint=hint, id=f"{app_label}.E{number:03}")]
+
+    register(check, Tags.caches)
+    register(deploy_check, Tags.caches, deploy=True)
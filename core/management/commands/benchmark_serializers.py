@@ -0,0 +1,60 @@
+import timeit
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.serializers import DynamicFieldsModelSerializer, _field_sets
+from post.models import Comment, Post
+from post.serializers import CommentSerializer, PostDetailSerializer
+from post.serializers.post_serializers import PostListSerializer
+from subreddit.models import Subreddit
+from subreddit.serializers import SubredditDetailSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Time constructing the common serializers with and without the "
+        "field set cache of `DynamicFieldsModelSerializer`"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--number", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        post = Post.objects.first()
+        comment = Comment.objects.first()
+        subreddit = Subreddit.objects.first()
+        if None in (post, comment, subreddit):
+            raise CommandError("Needs a subreddit, a post and a comment")
+
+        cases = {
+            "PostListSerializer": lambda: PostListSerializer(post),
+            "PostDetailSerializer(exclude)": lambda: PostDetailSerializer(
+                post, exclude=("subreddit",)
+            ),
+            "CommentSerializer(exclude)": lambda: CommentSerializer(
+                comment, exclude=["children"]
+            ),
+            "SubredditDetailSerializer": lambda: SubredditDetailSerializer(
+                subreddit
+            ),
+        }
+
+        number = options["number"]
+        self.stdout.write(
+            f"{'serializer':<32}{'uncached µs':>14}{'cached µs':>14}"
+            f"{'speedup':>10}"
+        )
+        for name, construct in cases.items():
+            timings = []
+            for cache_fields in (False, True):
+                DynamicFieldsModelSerializer.cache_fields = cache_fields
+                _field_sets.clear()
+                construct()  # warm up
+                seconds = min(timeit.repeat(construct, number=number, repeat=3))
+                timings.append(seconds / number * 1_000_000)
+            DynamicFieldsModelSerializer.cache_fields = True
+
+            self.stdout.write(
+                f"{name:<32}{timings[0]:>14.1f}{timings[1]:>14.1f}"
+                f"{timings[0] / timings[1]:>9.1f}x"
+            )
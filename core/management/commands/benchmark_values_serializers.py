@@ -0,0 +1,74 @@
+import timeit
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.preload import preload
+from core.values import ValuesSerializer
+from post.models import Post
+from post.serializers import PostDetailSerializer
+from post.serializers.post_serializers import PostListSerializer
+from subreddit.models import Subreddit
+from subreddit.serializers import SubredditListSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Time rendering a page of the list endpoints through their "
+        "serializers and from values with `ValuesSerializer`"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--page-size", type=int, default=25)
+        parser.add_argument("--number", type=int, default=50)
+
+    def handle(self, *args, **options):
+        page_size = options["page_size"]
+        cases = {
+            "PostListSerializer": (
+                Post.objects.ranked(),
+                lambda rows: PostListSerializer(rows, many=True),
+            ),
+            "PostDetailSerializer(exclude)": (
+                Post.objects.ranked(),
+                lambda rows: PostDetailSerializer(
+                    rows, many=True, exclude=("subreddit", "comments")
+                ),
+            ),
+            "SubredditListSerializer": (
+                Subreddit.objects.order_by("id"),
+                lambda rows: SubredditListSerializer(rows, many=True),
+            ),
+        }
+
+        number = options["number"]
+        self.stdout.write(
+            f"{'serializer':<32}{'rows':>6}{'serializer ms':>16}"
+            f"{'values ms':>12}{'speedup':>10}"
+        )
+        for name, (queryset, construct) in cases.items():
+            serializer = construct(None)
+            values_serializer = ValuesSerializer.for_serializer(serializer)
+            queryset = queryset[:page_size]
+
+            def serialize():
+                return construct(preload(queryset.all(), serializer)).data
+
+            def render():
+                return values_serializer.render(
+                    values_serializer.values(queryset.all())
+                )
+
+            expected = serialize()
+            if expected != render():
+                raise CommandError(f"{name} renders differently from values")
+
+            timings = [
+                min(timeit.repeat(case, number=number, repeat=3))
+                / number
+                * 1000
+                for case in (serialize, render)
+            ]
+            self.stdout.write(
+                f"{name:<32}{len(expected):>6}{timings[0]:>16.2f}"
+                f"{timings[1]:>12.2f}{timings[0] / timings[1]:>9.1f}x"
+            )
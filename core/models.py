@@ -1,3 +1,5 @@
+from django.core.exceptions import FieldDoesNotExist
+
 from model_utils.models import TimeStampedModel
 
 
@@ -13,20 +15,84 @@ class BaseModel(TimeStampedModel):
     def updated_on(self):
         return self.modified
 
-    def save(self, *args, **kwargs):
-        if self.pk:
-            # If self.pk is not None then it's an update.
-            cls = self.__class__
-            old = cls.objects.get(pk=self.pk)
-            # This will get the current model state since super().save() isn't called yet.
-            new = self  # This gets the newly instantiated Mode object with the new values.
-            changed_fields = []
-            for field in cls._meta.get_fields():
-                field_name = field.name
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Column values as loaded, `save` diffs against them
+        instance._loaded_values = instance._get_column_values()
+        return instance
+
+    def _get_column_values(self) -> dict:
+        """Current values of the concrete columns that aren't deferred"""
+
+        return {
+            field.attname: getattr(self, field.attname)
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__
+        }
+
+    def get_changed_fields(self) -> list[str]:
+        """Names of the concrete fields changed since the row was loaded"""
+
+        loaded = getattr(self, "_loaded_values", {})
+        changed = []
+        for field in self._meta.concrete_fields:
+            if field.primary_key or field.attname not in self.__dict__:
+                continue
+
+            value = getattr(self, field.attname)
+            # A newly assigned file only gets its final name once stored
+            if getattr(value, "_committed", True) is False:
+                changed.append(field.name)
+            elif field.attname not in loaded or loaded[field.attname] != value:
+                changed.append(field.name)
+        return changed
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        if not hasattr(self, "_loaded_values"):
+            return
+
+        values = self._get_column_values()
+        if fields is not None:
+            # Unsaved changes of the fields not refreshed, i.e. on loading a
+            # deferred field, still have to be saved
+            refreshed = set()
+            for name in fields:
                 try:
-                    if getattr(old, field_name) != getattr(new, field_name):
-                        changed_fields.append(field_name)
-                except Exception as e:  # Catch field does not exist exception
-                    pass
-            kwargs["update_fields"] = changed_fields
+                    refreshed.add(self._meta.get_field(name).attname)
+                except FieldDoesNotExist:
+                    # Prefetched relations can be named too
+                    continue
+            values = {
+                attname: value
+                for attname, value in values.items()
+                if attname in refreshed
+            }
+        self._loaded_values.update(values)
+
+    def save(self, *args, **kwargs):
+        loaded = getattr(self, "_loaded_values", None)
+        if (
+            loaded is not None
+            and self.pk is not None
+            and loaded.get(self._meta.pk.attname) == self.pk
+            and not args
+            and not kwargs.get("force_insert")
+            and kwargs.get("update_fields") is None
+        ):
+            # Only the changed columns are written, and with none changed
+            # Django skips the UPDATE altogether
+            kwargs["update_fields"] = self.get_changed_fields()
+
         super().save(*args, **kwargs)
+
+        values = self._get_column_values()
+        update_fields = kwargs.get("update_fields")
+        if loaded is None or update_fields is None:
+            self._loaded_values = values
+        elif update_fields:
+            # Fields left out of `update_fields` still hold unsaved values
+            for name in {*update_fields, "modified"}:
+                attname = self._meta.get_field(name).attname
+                loaded[attname] = values[attname]
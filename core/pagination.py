@@ -1,7 +1,289 @@
-from rest_framework.pagination import PageNumberPagination
+import hashlib
+import json
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections, models
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 
 class CustomPageNumberPagination(PageNumberPagination):
     page_size = 25
     page_size_query_param = "page_size"
     max_page_size = 100
+
+
+def estimate_count(queryset) -> int:
+    """
+    Row count of `queryset` as estimated by the PostgreSQL planner. Other
+    databases count exactly and cache the result for a while.
+    """
+
+    connection = connections[queryset.db]
+    if connection.vendor == "postgresql":
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    query = f"{queryset.db}:{queryset.query}".encode()
+    key = f"pagination:count:{hashlib.md5(query).hexdigest()}"
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, timeout=settings.PAGINATION_COUNT_CACHE_TIMEOUT)
+    return count
+
+
+class EstimatedCountPage(Page):
+    def has_next(self):
+        if self.paginator.count_is_approximate:
+            return self.has_more
+        return super().has_next()
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Counts exactly up to `PAGINATION_EXACT_COUNT_LIMIT` rows and estimates
+    above it. With an estimate, pages past the estimated last one are still
+    served and `has_next` comes from fetching one extra row.
+    """
+
+    count_is_approximate = False
+
+    @cached_property
+    def count(self):
+        limit = settings.PAGINATION_EXACT_COUNT_LIMIT
+        count = self.object_list[: limit + 1].count()
+        if count <= limit:
+            return count
+
+        self.count_is_approximate = True
+        return max(estimate_count(self.object_list), count)
+
+    def validate_number(self, number):
+        if not self.count_is_approximate:
+            return super().validate_number(number)
+
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(_("That page number is not an integer"))
+        if number < 1:
+            raise EmptyPage(_("That page number is less than 1"))
+        return number
+
+    def page(self, number):
+        # Evaluates `count` first so `validate_number` knows which rules apply
+        if self.count <= settings.PAGINATION_EXACT_COUNT_LIMIT:
+            return super().page(number)
+
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom : bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage(_("That page contains no results"))
+
+        page = self._get_page(rows[: self.per_page], number, self)
+        page.has_more = len(rows) > self.per_page
+        return page
+
+    def _get_page(self, *args, **kwargs):
+        return EstimatedCountPage(*args, **kwargs)
+
+
+class EstimatedCountPageNumberPagination(CustomPageNumberPagination):
+    """
+    Page number pagination for large tables. Above
+    `PAGINATION_EXACT_COUNT_LIMIT` rows `count` is an estimate and
+    `count_is_approximate` is true.
+    """
+
+    django_paginator_class = EstimatedCountPaginator
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "count": self.page.paginator.count,
+                "count_is_approximate": (
+                    self.page.paginator.count_is_approximate
+                ),
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count_is_approximate"] = {
+            "type": "boolean",
+            "example": False,
+        }
+        return response_schema
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination that seeks past the last row of the previous page
+    instead of counting and offsetting, so every page costs the same.
+
+    Rows are paged in the queryset's ordering (or the model's default one),
+    which must end in a unique column; `id` is appended otherwise. The cursor
+    is the signed ordering values of the last row returned.
+    """
+
+    page_size = 25
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    ordering = ("-created", "-id")
+    salt = "core.pagination.keyset"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        ordering = self.get_ordering(queryset)
+        queryset = queryset.order_by(*ordering)
+
+        position = self.decode_cursor(request, queryset.model, ordering)
+        if position is not None:
+            queryset = queryset.filter(self.seek(ordering, position))
+
+        rows = list(queryset[: page_size + 1])
+        self.next_position = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            self.next_position = self.get_position(rows[-1], ordering)
+        self.page_ordering = ordering
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+    def get_page_size(self, request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size < 1:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, queryset) -> tuple[str, ...]:
+        ordering = (
+            tuple(queryset.query.order_by)
+            or tuple(queryset.model._meta.ordering)
+            or self.ordering
+        )
+        if ordering[-1].lstrip("-") not in ("id", "pk"):
+            ordering += ("-id" if ordering[-1].startswith("-") else "id",)
+        return ordering
+
+    @staticmethod
+    def seek(ordering: tuple[str, ...], position: list) -> Q:
+        """Rows strictly after `position` in `ordering`"""
+
+        condition = Q()
+        for index, field in enumerate(ordering):
+            lookup = "lt" if field.startswith("-") else "gt"
+            equal = {
+                previous.lstrip("-"): position[previous_index]
+                for previous_index, previous in enumerate(ordering[:index])
+            }
+            condition |= Q(
+                **equal, **{f"{field.lstrip('-')}__{lookup}": position[index]}
+            )
+        return condition
+
+    @staticmethod
+    def get_position(row, ordering: tuple[str, ...]) -> list:
+        names = [field.lstrip("-") for field in ordering]
+        if isinstance(row, dict):
+            return [row[name] for name in names]
+        return [getattr(row, name) for name in names]
+
+    def get_next_link(self) -> str | None:
+        if self.next_position is None:
+            return None
+
+        cursor = signing.dumps(
+            {
+                "ordering": list(self.page_ordering),
+                "position": [
+                    value.isoformat() if hasattr(value, "isoformat") else value
+                    for value in self.next_position
+                ],
+            },
+            salt=self.salt,
+        )
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request, model, ordering) -> list | None:
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+
+        try:
+            data = signing.loads(cursor, salt=self.salt)
+            if tuple(data["ordering"]) != ordering:
+                raise ValueError("Cursor of another ordering")
+
+            position = []
+            for field, value in zip(ordering, data["position"], strict=True):
+                name = field.lstrip("-")
+                if name != "pk" and isinstance(
+                    model._meta.get_field(name), models.DateTimeField
+                ):
+                    value = parse_datetime(value)
+                position.append(value)
+            return position
+        except (signing.BadSignature, KeyError, TypeError, ValueError):
+            raise ValidationError(detail={"message": "Invalid `cursor`."})
+
+
+# Paginations a client can pick with `?pagination=` on list endpoints
+PAGINATION_CHOICES = {
+    "cursor": KeysetPagination,
+    "page": EstimatedCountPageNumberPagination,
+}
@@ -0,0 +1,155 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch, QuerySet
+
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField, RelatedField
+
+# Works out from a serializer's fields which relations its rows read, so a
+# queryset can load them up front: `select_related` for single relations,
+# `prefetch_related` for many and `only()` for the columns rendered. Levels
+# with fields that aren't plain columns (methods, properties, method fields)
+# keep all their columns.
+
+
+class Plan:
+    def __init__(self):
+        self.select = set()
+        self.prefetch = {}
+        # Columns read per `select_related` path, "" being the queryset's
+        self.columns = {"": set()}
+        self.unrestricted = set()
+
+    def level(self, path: str) -> set:
+        return self.columns.setdefault(path, set())
+
+    def apply(self, queryset: QuerySet) -> QuerySet:
+        selected = queryset.query.select_related
+        if self.select:
+            queryset = queryset.select_related(*sorted(self.select))
+        if self.prefetch:
+            queryset = queryset.prefetch_related(*self.prefetch.values())
+
+        if "" in self.unrestricted or selected is True:
+            return queryset
+
+        model = queryset.model
+        only = {model._meta.pk.attname, *self.columns[""]}
+        # Related managers set their instance on the rows through these
+        only.update(field.attname for field in queryset._known_related_objects)
+        for ordering in queryset.query.order_by or model._meta.ordering:
+            name = str(ordering).lstrip("-")
+            if "__" not in name and name != "?":
+                only.add(name)
+
+        for path in self.select | set(flatten(selected or {})):
+            columns = self.columns.get(path)
+            if columns and path not in self.unrestricted:
+                only.update(f"{path}__{column}" for column in columns)
+            else:
+                # Naming just the relation loads all of its columns
+                only.add(path)
+        return queryset.only(*only)
+
+
+def flatten(select_related: dict, prefix: str = ""):
+    """Paths of a `query.select_related` tree"""
+
+    for name, nested in select_related.items():
+        path = join(prefix, name)
+        yield path
+        yield from flatten(nested, path)
+
+
+def join(*parts: str) -> str:
+    return "__".join(part for part in parts if part)
+
+
+def get_serializer_fields(serializer) -> dict:
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    return serializer.fields
+
+
+def plan_fields(plan: Plan, fields: dict, model, path: str) -> None:
+    for field in fields.values():
+        if field.write_only:
+            continue
+        if field.source == "*":
+            # Method fields and the like may read anything of the row
+            plan.unrestricted.add(path)
+            continue
+        plan_field(plan, field, model, path, field.source.split("."))
+
+
+def plan_field(plan: Plan, field, model, path: str, attrs: list) -> None:
+    for index, attr in enumerate(attrs):
+        last = index == len(attrs) - 1
+        try:
+            model_field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            plan.unrestricted.add(path)
+            return
+
+        if not model_field.is_relation:
+            plan.level(path).add(model_field.attname)
+            return
+
+        if model_field.many_to_many or model_field.one_to_many:
+            plan_many(plan, field if last else None, model_field, path, attr)
+            return
+
+        if getattr(model_field, "attname", None):
+            plan.level(path).add(model_field.attname)
+        if (
+            last
+            and isinstance(field, RelatedField)
+            and field.use_pk_only_optimization()
+        ):
+            # Rendered from the foreign key column alone
+            return
+
+        path = join(path, attr)
+        model = model_field.related_model
+        plan.select.add(path)
+        plan.level(path)
+
+    if isinstance(field, serializers.BaseSerializer):
+        plan_fields(plan, get_serializer_fields(field), model, path)
+    elif isinstance(field, serializers.SlugRelatedField):
+        plan.level(path).add(field.slug_field)
+    else:
+        # Rendered from the related object, i.e. with `str()`
+        plan.unrestricted.add(path)
+
+
+def plan_many(plan: Plan, field, model_field, path: str, attr: str) -> None:
+    lookup = join(path, attr)
+    related_model = model_field.related_model
+
+    child = None
+    if isinstance(field, serializers.ListSerializer):
+        child = field.child
+    elif isinstance(field, ManyRelatedField):
+        child = field.child_relation
+
+    queryset = related_model._default_manager.all()
+    if isinstance(child, serializers.BaseSerializer):
+        queryset = preload(queryset, child)
+        if model_field.one_to_many and queryset.query.deferred_loading[0]:
+            # The prefetch matches rows to their parent by the foreign key
+            queryset = queryset.only(
+                *queryset.query.deferred_loading[0],
+                model_field.field.attname,
+            )
+    plan.prefetch[lookup] = Prefetch(lookup, queryset=queryset)
+
+
+def preload(queryset: QuerySet, serializer) -> QuerySet:
+    """
+    `queryset` loading the relations and columns that `serializer`, or the
+    child of a list serializer, renders
+    """
+
+    plan = Plan()
+    plan_fields(plan, get_serializer_fields(serializer), queryset.model, "")
+    return plan.apply(queryset)
@@ -1,4 +1,55 @@
+import copy
+import logging
+
+from django.db import connection
+from django.db.models import QuerySet
+from django.db.models.manager import BaseManager
+
 from rest_framework import serializers
+from rest_framework.utils.serializer_helpers import BindingDict
+
+from core.cache import LocalCache
+
+logger = logging.getLogger(__name__)
+
+# Unbound fields of each (serializer, fields, exclude, read only) signature
+_field_sets = LocalCache(maxsize=1024, ttl=float("inf"))
+
+
+def _signature(names) -> frozenset | None:
+    return None if names is None else frozenset(names)
+
+
+class PreloadCheckingListSerializer(serializers.ListSerializer):
+    """
+    Logs a warning when rendering the rows runs queries, meaning the child
+    reads relations that weren't loaded up front (see `core.preload`)
+    """
+
+    def to_representation(self, data):
+        rows = data.all() if isinstance(data, BaseManager) else data
+        if isinstance(rows, QuerySet):
+            rows = list(rows)
+
+        queries = []
+
+        def record(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(record):
+            representation = super().to_representation(rows)
+
+        if queries:
+            logger.warning(
+                "%s ran %d queries rendering %d rows, preload the relations "
+                "it reads. First query: %s",
+                self.child.__class__.__name__,
+                len(queries),
+                len(rows),
+                queries[0],
+            )
+        return representation
 
 
 class DynamicFieldsModelSerializer(serializers.ModelSerializer):
@@ -7,6 +58,11 @@ class DynamicFieldsModelSerializer(serializers.ModelSerializer):
     controls which fields should be displayed.
     """
 
+    # The fields left after `fields`, `exclude` and `read_only_fields` are
+    # built once per class and signature, later serializers get copies.
+    # Turn off for serializers whose fields depend on anything else.
+    cache_fields = True
+
     def __init__(self, *args, **kwargs):
         # Don't pass the 'fields' arg up to the superclass
         fields = kwargs.pop("fields", None)
@@ -18,24 +74,59 @@ class DynamicFieldsModelSerializer(serializers.ModelSerializer):
         # Instantiate the superclass normally
         super(DynamicFieldsModelSerializer, self).__init__(*args, **kwargs)
 
+        if not self.cache_fields:
+            self._prune_fields(self.fields, fields, exclude, read_only_fields)
+            return
+
+        key = (
+            self.__class__,
+            _signature(fields),
+            _signature(exclude),
+            _signature(read_only_fields),
+            # `create_only_fields` are read only once there is an instance
+            self.instance is not None,
+        )
+        prototype = _field_sets.get(key)
+        if prototype is None:
+            prototype = self.get_fields()
+            self._prune_fields(prototype, fields, exclude, read_only_fields)
+            _field_sets.set(key, prototype)
+
+        # Same as the `fields` property, from copies of the cached fields
+        bound = BindingDict(self)
+        for field_name, field in prototype.items():
+            bound[field_name] = clone = copy.deepcopy(field)
+            # A copy is built from the field's arguments, which lack this
+            clone.read_only = field.read_only
+        self.__dict__["fields"] = bound
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_serializer = super().many_init(*args, **kwargs)
+        if not hasattr(getattr(cls, "Meta", None), "list_serializer_class"):
+            list_serializer.__class__ = PreloadCheckingListSerializer
+        return list_serializer
+
+    @staticmethod
+    def _prune_fields(all_fields, fields, exclude, read_only_fields) -> None:
         if fields is not None:
             # Drop any fields that are not specified in the `fields` argument.
             allowed = set(fields)
-            existing = set(self.fields)
+            existing = set(all_fields)
             for field_name in existing - allowed:
-                self.fields.pop(field_name)
+                all_fields.pop(field_name)
 
         if exclude is not None:
-            existing = set(self.fields)
+            existing = set(all_fields)
             for field_name in existing:
                 if field_name in exclude:
-                    self.fields.pop(field_name)
+                    all_fields.pop(field_name)
 
         # another bit we're adding to documented example, to take care of readonly fields
         if read_only_fields is not None:
             for f in read_only_fields:
                 try:
-                    self.fields[f].read_only = True
+                    all_fields[f].read_only = True
                 except KeyError:
                     # not in fields anyway
                     pass
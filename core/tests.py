@@ -1,3 +1,50 @@
 from django.test import TestCase
 
+from post.models import Post
+from subreddit.models import Subreddit
+from users.models import User
+
 # Create your tests here.
+
+
+class BaseModelDirtyFieldsTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(username="owner", password="x")
+        subreddit = Subreddit.objects.create(
+            owner=user, name="dirty", display_name="Dirty"
+        )
+        cls.post = Post.objects.create(
+            user=user,
+            subreddit=subreddit,
+            title="Title",
+            body="Body",
+            slug="dirty",
+            post_type="text",
+        )
+
+    def test_change_saved_after_loading_deferred_field(self):
+        post = Post.objects.only("id", "title").get(pk=self.post.pk)
+        post.title = "Changed"
+        self.assertEqual(post.body, "Body")
+        post.save()
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.title, "Changed")
+
+    def test_change_saved_after_partial_refresh(self):
+        post = Post.objects.get(pk=self.post.pk)
+        post.title = "Changed"
+        post.refresh_from_db(fields=["body"])
+        post.save()
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.title, "Changed")
+
+    def test_refreshed_field_no_longer_dirty(self):
+        post = Post.objects.get(pk=self.post.pk)
+        post.title = "Changed"
+        post.refresh_from_db(fields=["title"])
+
+        self.assertEqual(post.title, "Title")
+        self.assertEqual(post.get_changed_fields(), [])
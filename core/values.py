@@ -0,0 +1,185 @@
+import copy
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db import models
+from django.db.models import QuerySet
+
+from rest_framework import serializers
+from rest_framework.relations import PrimaryKeyRelatedField, SlugRelatedField
+
+from core.cache import LocalCache
+from core.preload import get_serializer_fields, join
+
+# Renders the rows of a read serializer from `.values()` instead of model
+# instances. The serializer's fields are compiled once into the columns they
+# read and a converter per field, rendering a row is then a loop over them.
+# Only fields that map onto columns are supported: model fields, choice
+# displays, primary key and slug relations and nested serializers of single
+# relations.
+
+# Compiled `ValuesSerializer` of each (serializer, fields) signature
+_compiled = LocalCache(maxsize=256, ttl=float("inf"))
+
+# Fields whose `to_representation` returns these columns' values as loaded
+IDENTITY_FIELDS = {
+    serializers.BooleanField: (models.BooleanField,),
+    serializers.CharField: (models.CharField, models.TextField),
+    serializers.IntegerField: (models.IntegerField,),
+    serializers.ReadOnlyField: (models.Field,),
+}
+
+
+def identity(value):
+    return value
+
+
+class ValuesSerializer:
+    """
+    Read only rendering of `serializer` (or the child of a list serializer)
+    from `.values()` rows, producing the same data as its `.data`
+    """
+
+    def __init__(self, serializer):
+        self.columns = []
+        self.model = serializer.Meta.model
+        self.fields = self.compile(get_serializer_fields(serializer), "")
+
+    @classmethod
+    def for_serializer(cls, serializer) -> "ValuesSerializer":
+        """Compiled once per serializer class and set of fields"""
+
+        if isinstance(serializer, serializers.ListSerializer):
+            serializer = serializer.child
+        key = (serializer.__class__, tuple(serializer.fields))
+        values_serializer = _compiled.get(key)
+        if values_serializer is None:
+            values_serializer = cls(serializer)
+            _compiled.set(key, values_serializer)
+        return values_serializer
+
+    def values(self, queryset: QuerySet) -> QuerySet:
+        """`queryset` as `.values()` rows holding the columns rendered"""
+
+        columns = {queryset.model._meta.pk.attname, *self.columns}
+        # Keyset pagination reads its cursor position from the rows
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        for name in ordering:
+            if isinstance(name, str) and name != "?":
+                columns.add(name.lstrip("-"))
+        return (
+            queryset.select_related(None)
+            .prefetch_related(None)
+            .values(*sorted(columns))
+        )
+
+    def render(self, rows) -> list[dict]:
+        return [self.render_row(row, self.fields) for row in rows]
+
+    @classmethod
+    def render_row(cls, row: dict, fields: list) -> dict:
+        ret = {}
+        for name, column, convert, nested in fields:
+            value = row[column]
+            if value is None:
+                ret[name] = None
+            elif nested is not None:
+                ret[name] = cls.render_row(row, nested)
+            else:
+                ret[name] = convert(value)
+        return ret
+
+    def compile(self, fields: dict, path: str, model=None) -> list[tuple]:
+        """
+        `(name, column, converter, nested fields)` of each readable field.
+        A nested field's column is the foreign key, rendering `None` when
+        it is null.
+        """
+
+        model = model or self.model
+        compiled = []
+        for name, field in fields.items():
+            if field.write_only:
+                continue
+            column, convert, nested = self.compile_field(field, model, path)
+            if column not in self.columns:
+                self.columns.append(column)
+            compiled.append((name, column, convert, nested))
+        return compiled
+
+    def compile_field(self, field, model, path: str) -> tuple:
+        attrs = field.source_attrs
+        if not attrs or isinstance(field, serializers.SerializerMethodField):
+            self.unsupported(field, "reads the whole instance")
+        if isinstance(field, serializers.ListSerializer):
+            self.unsupported(field, "renders a many relation")
+
+        # Single relations along a dotted `source`
+        for attr in attrs[:-1]:
+            model_field = self.get_model_field(field, model, attr)
+            if not (model_field.many_to_one or model_field.one_to_one):
+                self.unsupported(field, f"reads through `{attr}`")
+            if model_field.null:
+                self.unsupported(field, f"reads through nullable `{attr}`")
+            path = join(path, attr)
+            model = model_field.related_model
+
+        attr = attrs[-1]
+        display = self.get_display_field(model, attr)
+        if display is not None:
+            labels = dict(display.flatchoices)
+            return (
+                join(path, display.attname),
+                lambda value: str(labels.get(value, value)),
+                None,
+            )
+
+        model_field = self.get_model_field(field, model, attr)
+        if not model_field.is_relation:
+            column = join(path, model_field.attname)
+            if isinstance(model_field, IDENTITY_FIELDS.get(type(field), ())):
+                return column, identity, None
+            # An unbound copy, the field holds on to its serializer's context
+            return column, copy.deepcopy(field).to_representation, None
+
+        if not (model_field.many_to_one or model_field.one_to_one):
+            self.unsupported(field, "renders a many relation")
+        if not model_field.concrete:
+            self.unsupported(field, "renders a reverse relation")
+
+        column = join(path, model_field.attname)
+        if isinstance(field, serializers.BaseSerializer):
+            nested = self.compile(
+                get_serializer_fields(field),
+                join(path, attr),
+                model_field.related_model,
+            )
+            return column, None, nested
+        if type(field) is PrimaryKeyRelatedField and field.pk_field is None:
+            return column, identity, None
+        if type(field) is SlugRelatedField:
+            return join(path, attr, field.slug_field), identity, None
+        self.unsupported(field, "renders the related object")
+
+    def get_model_field(self, field, model, attr: str):
+        try:
+            return model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            self.unsupported(field, f"reads `{attr}`, which isn't a field")
+
+    @staticmethod
+    def get_display_field(model, attr: str):
+        """The choice field of a `get_<field>_display` source"""
+
+        if not (attr.startswith("get_") and attr.endswith("_display")):
+            return None
+        try:
+            model_field = model._meta.get_field(attr[4:-8])
+        except FieldDoesNotExist:
+            return None
+        return model_field if model_field.choices else None
+
+    def unsupported(self, field, reason: str):
+        raise ImproperlyConfigured(
+            f"`{field.field_name}` of {field.parent.__class__.__name__} "
+            f"can't be rendered from values, it {reason}."
+        )
@@ -34,6 +34,13 @@ class CommentAdminForm(forms.ModelForm):
                     field=None,
                     error="Parent comment doesn't belong to the Post",
                 )
+            if self.instance.path and parent.path.startswith(
+                self.instance.path
+            ):
+                self.add_error(
+                    field="parent",
+                    error="Comment cannot be moved under its own reply",
+                )
 
         return self.cleaned_data
 
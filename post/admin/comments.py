@@ -19,10 +19,21 @@ class CommentAdmin(admin.ModelAdmin):
 
     get_text.short_description = "Text"
 
+    def delete_queryset(self, request, queryset):
+        # Delete one by one so the counters are kept in sync, skipping
+        # comments that go away with a selected ancestor anyway
+        roots = []
+        for comment in queryset.order_by("path"):
+            if roots and comment.path.startswith(roots[-1].path):
+                continue
+            roots.append(comment)
+
+        for comment in roots:
+            comment.delete()
+
     @admin.action(description="Lock selected Comment thread")
     def lock_comments(self, request, queryset):
-        updated = queryset.update(
-            locked=True,
+        updated = queryset.lock_threads(
             last_locked_at=timezone.now(),
             last_locked_by=request.user,
         )
@@ -38,8 +49,7 @@ class CommentAdmin(admin.ModelAdmin):
 
     @admin.action(description="Unlock selected Comment thread")
     def unlock_comments(self, request, queryset):
-        updated = queryset.update(
-            locked=False,
+        updated = queryset.unlock_threads(
             last_unlocked_at=timezone.now(),
             last_unlocked_by=request.user,
         )
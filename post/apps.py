@@ -5,3 +5,6 @@ class PostConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "post"
     verbose_name = "Post & Comments"
+
+    def ready(self):
+        from post import checks  # noqa: F401
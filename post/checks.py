@@ -0,0 +1,5 @@
+from core.checks import register_shared_cache_check
+
+# `refresh_popular` computes the popular lists and folds the views counted by
+# the web processes in a process of its own
+register_shared_cache_check("post", 1, "the popular feed and view counts")
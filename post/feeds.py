@@ -0,0 +1,323 @@
+import bisect
+import heapq
+from datetime import datetime
+from itertools import islice
+from typing import Iterable
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Q, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from rest_framework.exceptions import ValidationError
+
+from common.constants import FeedConstants
+from post.models import FeedEntry, Post
+from subreddit.models import Subreddit, SubredditUser
+from subreddit.subscriptions import get_subscriptions
+
+# Home feeds are fanned out on write: the `fan_out_feeds` command pushes every
+# new post into a `FeedEntry` timeline per member of its subreddit, capped at
+# `FEED_TIMELINE_LENGTH`. Subreddits with more than `FEED_FAN_OUT_MAX_MEMBERS`
+# members are skipped and merged into the timeline when it is read, from a
+# cache of each subreddit's newest posts. With `FEED_FAN_OUT` off the whole
+# feed is built that way.
+
+CURSOR_SALT = "post.feeds.home"
+
+
+def is_fanned_out(member_count: int) -> bool:
+    return member_count <= settings.FEED_FAN_OUT_MAX_MEMBERS
+
+
+def dump_cursor(created: datetime, post_id: int) -> str:
+    return signing.dumps(
+        {"created": created.isoformat(), "id": post_id}, salt=CURSOR_SALT
+    )
+
+
+def load_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        data = signing.loads(cursor, salt=CURSOR_SALT)
+        return parse_datetime(data["created"]), int(data["id"])
+    except (signing.BadSignature, KeyError, TypeError, ValueError):
+        raise ValidationError(detail={"message": "Invalid `cursor`."})
+
+
+def before(created: datetime, post_id: int, field: str = "id") -> Q:
+    """Rows after `(created, post_id)` in newest first order"""
+
+    return Q(created__lt=created) | Q(
+        created=created, **{f"{field}__lt": post_id}
+    )
+
+
+def fan_out(post_ids: Iterable[int]) -> set[int]:
+    """Push posts into their subreddit members' timelines"""
+
+    posts = Post.objects.filter(
+        pk__in=post_ids,
+        subreddit__member_count__lte=settings.FEED_FAN_OUT_MAX_MEMBERS,
+    ).values_list("pk", "subreddit_id", "created")
+
+    users = set()
+    for post_id, subreddit_id, created in posts:
+        members = SubredditUser.objects.filter(
+            subreddit_id=subreddit_id
+        ).values_list("user_id", flat=True)
+
+        entries = (
+            FeedEntry(
+                user_id=user_id,
+                post_id=post_id,
+                subreddit_id=subreddit_id,
+                created=created,
+            )
+            for user_id in members.iterator(chunk_size=2000)
+        )
+        while batch := list(islice(entries, 1000)):
+            FeedEntry.objects.bulk_create(batch, ignore_conflicts=True)
+            users.update(entry.user_id for entry in batch)
+
+    return users
+
+
+def trim_timelines(user_ids: Iterable[int]) -> int:
+    """Drop entries beyond `FEED_TIMELINE_LENGTH` from the users' timelines"""
+
+    user_ids = list(user_ids)
+    trimmed = 0
+    for start in range(0, len(user_ids), 500):
+        overflow = (
+            FeedEntry.objects.filter(user_id__in=user_ids[start : start + 500])
+            .annotate(
+                position=Window(
+                    RowNumber(),
+                    partition_by=F("user_id"),
+                    order_by=(F("created").desc(), F("post_id").desc()),
+                )
+            )
+            .filter(position__gt=settings.FEED_TIMELINE_LENGTH)
+            .values_list("pk", flat=True)
+        )
+        trimmed += FeedEntry.objects.filter(pk__in=list(overflow)).delete()[0]
+    return trimmed
+
+
+@transaction.atomic
+def fan_out_pending(batch_size: int) -> int:
+    """
+    Fan out the oldest posts that weren't yet. Posts are claimed with
+    `SKIP LOCKED` so several workers can run at once.
+    """
+
+    post_ids = list(
+        Post.objects.filter(fanned_out_at__isnull=True)
+        .order_by("pk")
+        .select_for_update(skip_locked=True)
+        .values_list("pk", flat=True)[:batch_size]
+    )
+    if not post_ids:
+        return 0
+
+    trim_timelines(fan_out(post_ids))
+    Post.objects.filter(pk__in=post_ids).update(fanned_out_at=timezone.now())
+    return len(post_ids)
+
+
+def backfill_timeline(user_id: int, subreddit_ids: Iterable[int]) -> None:
+    """Fill a timeline with the newest posts of freshly joined subreddits"""
+
+    posts = Post.objects.filter(
+        subreddit_id__in=subreddit_ids,
+        subreddit__member_count__lte=settings.FEED_FAN_OUT_MAX_MEMBERS,
+    ).order_by("-created", "-id")[: settings.FEED_TIMELINE_LENGTH]
+
+    FeedEntry.objects.bulk_create(
+        [
+            FeedEntry(
+                user_id=user_id,
+                post_id=post_id,
+                subreddit_id=subreddit_id,
+                created=created,
+            )
+            for post_id, subreddit_id, created in posts.values_list(
+                "pk", "subreddit_id", "created"
+            )
+        ],
+        ignore_conflicts=True,
+    )
+    trim_timelines([user_id])
+
+
+def get_recent_posts(subreddit_ids: list[int]) -> dict[int, list[tuple]]:
+    """
+    Newest `(created, id, post_type)` of each subreddit, newest first and at
+    most `FEED_RECENT_POSTS` long. Cache misses are filled from the
+    `(subreddit, -created, -id)` index.
+    """
+
+    keys = {
+        FeedConstants.RECENT_POSTS_CACHE_KEY.format(subreddit_id): subreddit_id
+        for subreddit_id in subreddit_ids
+    }
+    cached = cache.get_many(keys)
+    recent = {keys[key]: posts for key, posts in cached.items()}
+
+    missing = {}
+    for key, subreddit_id in keys.items():
+        if key not in cached:
+            missing[key] = recent[subreddit_id] = list(
+                Post.objects.filter(subreddit_id=subreddit_id)
+                .order_by("-created", "-id")
+                .values_list("created", "id", "post_type")[
+                    : settings.FEED_RECENT_POSTS
+                ]
+            )
+    if missing:
+        cache.set_many(missing, timeout=FeedConstants.RECENT_POSTS_TIMEOUT)
+
+    return recent
+
+
+def iter_subreddit_posts(
+    subreddit_id: int,
+    recent: list[tuple],
+    position: tuple[datetime, int] | None,
+    post_type: str | None,
+):
+    """
+    `(created, id)` of a subreddit's posts past `position`, newest first.
+    Served from `recent`, and from the database once a full cache runs out.
+    """
+
+    start = 0
+    if position is not None:
+        # `recent` is sorted newest first, so skip what is not past `position`
+        start = bisect.bisect_left(
+            recent, True, key=lambda row: (row[0], row[1]) < position
+        )
+
+    last = position
+    for created, post_id, type_ in islice(recent, start, None):
+        last = (created, post_id)
+        if post_type is None or type_ == post_type:
+            yield last
+
+    if len(recent) < settings.FEED_RECENT_POSTS:
+        return
+
+    posts = Post.objects.filter(subreddit_id=subreddit_id)
+    if last is not None:
+        posts = posts.filter(before(*last))
+    if post_type is not None:
+        posts = posts.filter(post_type=post_type)
+    yield from posts.order_by("-created", "-id").values_list(
+        "created", "id"
+    ).iterator(chunk_size=100)
+
+
+class HomeFeed:
+    """
+    Newest first page of a user's subscribed feed. Timeline entries are
+    merged with the posts of joined subreddits too large to fan out.
+    """
+
+    def __init__(self, user, page_size: int, post_type: str | None = None):
+        self.user = user
+        self.page_size = page_size
+        self.post_type = post_type
+
+    def get_subreddits(self) -> tuple[list[int], list[int]]:
+        """Joined subreddits split into fanned out and merged on read"""
+
+        fanned_out, merged = [], []
+        for subreddit_id, member_count in Subreddit.objects.filter(
+            pk__in=get_subscriptions(self.user.id)
+        ).values_list("pk", "member_count"):
+            if is_fanned_out(member_count):
+                fanned_out.append(subreddit_id)
+            else:
+                merged.append(subreddit_id)
+        return fanned_out, merged
+
+    def get_sources(self, position, size: int) -> list:
+        """Iterables of `(created, id)`, each newest first"""
+
+        fanned_out, merged = self.get_subreddits()
+
+        sources = []
+        if fanned_out:
+            entries = FeedEntry.objects.filter(
+                user=self.user, subreddit_id__in=fanned_out
+            )
+            if position:
+                entries = entries.filter(before(*position, field="post_id"))
+            if self.post_type:
+                entries = entries.filter(post__post_type=self.post_type)
+            sources.append(
+                entries.order_by("-created", "-post_id").values_list(
+                    "created", "post_id"
+                )[:size]
+            )
+
+        recent = get_recent_posts(merged)
+        for subreddit_id in merged:
+            sources.append(
+                iter_subreddit_posts(
+                    subreddit_id, recent[subreddit_id], position, self.post_type
+                )
+            )
+        return sources
+
+    def get_page(
+        self, cursor: str | None = None
+    ) -> tuple[list[Post], str | None]:
+        position = load_cursor(cursor) if cursor else None
+        size = self.page_size + 1
+
+        # k-way merge, only `size` keys are ever taken from the sources
+        keys = []
+        seen = set()
+        for key in heapq.merge(*self.get_sources(position, size), reverse=True):
+            if key[1] not in seen:
+                seen.add(key[1])
+                keys.append(key)
+            if len(keys) == size:
+                break
+
+        has_next = len(keys) > self.page_size
+        keys = keys[: self.page_size]
+
+        posts = Post.objects.select_related("user", "subreddit").in_bulk(
+            [post_id for _, post_id in keys]
+        )
+        page = [posts[post_id] for _, post_id in keys if post_id in posts]
+        next_cursor = dump_cursor(*keys[-1]) if has_next else None
+        return page, next_cursor
+
+
+class MergedFeed(HomeFeed):
+    """
+    Subscribed feed built only by merging the joined subreddits' cached
+    newest posts, for deployments that don't run `fan_out_feeds`
+    """
+
+    def get_sources(self, position, size: int) -> list:
+        subreddit_ids = list(get_subscriptions(self.user.id))
+        recent = get_recent_posts(subreddit_ids)
+        return [
+            iter_subreddit_posts(
+                subreddit_id, recent[subreddit_id], position, self.post_type
+            )
+            for subreddit_id in subreddit_ids
+        ]
+
+
+def get_home_feed(user, page_size: int, post_type: str | None = None):
+    feed_class = HomeFeed if settings.FEED_FAN_OUT else MergedFeed
+    return feed_class(user=user, page_size=page_size, post_type=post_type)
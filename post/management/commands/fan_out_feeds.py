@@ -0,0 +1,69 @@
+import time
+from itertools import groupby
+from operator import itemgetter
+
+from django.core.management.base import BaseCommand
+
+from post.feeds import backfill_timeline, fan_out_pending
+from subreddit.models import SubredditUser
+
+
+class Command(BaseCommand):
+    help = (
+        "Push new posts into the home feed timelines of their subreddit "
+        "members. Runs as a worker polling every `--interval` seconds, "
+        "several workers can run side by side."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, default=2.0)
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=20,
+            help="Posts fanned out per transaction",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Fan out the pending posts once and exit",
+        )
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Refill every timeline from the joined subreddits and exit",
+        )
+
+    def handle(self, *args, **options):
+        if options["rebuild"]:
+            return self.rebuild()
+
+        while True:
+            fanned_out = 0
+            while posts := fan_out_pending(options["batch_size"]):
+                fanned_out += posts
+
+            if options["verbosity"] > 1 or options["once"]:
+                self.stdout.write(
+                    self.style.SUCCESS(f"Fanned out {fanned_out} post(s)")
+                )
+
+            if options["once"]:
+                return
+            time.sleep(options["interval"])
+
+    def rebuild(self) -> None:
+        memberships = SubredditUser.objects.order_by("user_id").values_list(
+            "user_id", "subreddit_id"
+        )
+
+        rebuilt = 0
+        for user_id, rows in groupby(
+            memberships.iterator(chunk_size=2000), key=itemgetter(0)
+        ):
+            backfill_timeline(
+                user_id, [subreddit_id for _, subreddit_id in rows]
+            )
+            rebuilt += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rebuilt} timeline(s)"))
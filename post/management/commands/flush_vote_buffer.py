@@ -0,0 +1,54 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from post.models import Comment, Post
+from post.votes import flush_vote_buffer
+
+
+class Command(BaseCommand):
+    help = (
+        "Apply buffered votes. Runs as a worker that drains the buffer every "
+        "`--interval` seconds, so a vote is applied at most about one "
+        "interval after it was cast. Several workers can run side by side."
+    )
+
+    item_models = (Post, Comment)
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait once the buffer is drained",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=200,
+            help="Items claimed per transaction",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the buffer once and exit",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            flushed = self.drain(options["batch_size"])
+            if options["verbosity"] > 1 or options["once"]:
+                self.stdout.write(
+                    self.style.SUCCESS(f"Applied {flushed} vote(s)")
+                )
+
+            if options["once"]:
+                return
+            time.sleep(options["interval"])
+
+    def drain(self, batch_size: int) -> int:
+        flushed = 0
+        for item_model in self.item_models:
+            while applied := flush_vote_buffer(item_model, batch_size):
+                flushed += applied
+        return flushed
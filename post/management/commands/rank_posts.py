@@ -0,0 +1,82 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from post.models import Post
+from post.ranking import rank_rows
+
+RANK_FIELDS = (
+    "hot_rank",
+    "best_rank",
+    "rising_rank",
+    "controversial_rank",
+    "random_rank",
+    "ranked_at",
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the stored feed ranks of recent posts in batches. Runs as "
+        "a scheduler every `--interval` seconds unless `--once` is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hours",
+            type=float,
+            default=72,
+            help="Rank posts created within this many hours",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Rank every post, e.g. after changing a formula",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--interval", type=float, default=300)
+        parser.add_argument("--once", action="store_true")
+
+    def handle(self, *args, **options):
+        while True:
+            ranked = self.rank(options)
+            self.stdout.write(self.style.SUCCESS(f"Ranked {ranked} post(s)"))
+
+            if options["once"]:
+                return
+            time.sleep(options["interval"])
+
+    def rank(self, options) -> int:
+        now = timezone.now()
+        posts = Post.objects.order_by("pk")
+        if not options["all"]:
+            since = now - timedelta(hours=options["hours"])
+            # Young posts, plus older ones that were never ranked
+            posts = posts.filter(
+                Q(created__gte=since) | Q(ranked_at__isnull=True)
+            )
+
+        rows = posts.values_list(
+            "pk", "created", "score", "upvotes", "downvotes", "comment_count"
+        )
+
+        ranked = 0
+        last_pk = 0
+        while batch := list(
+            rows.filter(pk__gt=last_pk)[: options["batch_size"]]
+        ):
+            last_pk = batch[-1][0]
+
+            updated = []
+            for ranks in rank_rows(batch, now=now):
+                post = Post(**ranks)
+                post.ranked_at = now
+                updated.append(post)
+
+            Post.objects.bulk_update(updated, fields=RANK_FIELDS)
+            ranked += len(updated)
+
+        return ranked
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from post.trending import refresh_popular
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the popular feed lists from the engagement of the sliding "
+        "window. Runs as a scheduler every `--interval` seconds unless "
+        "`--once` is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, default=60)
+        parser.add_argument("--once", action="store_true")
+
+    def handle(self, *args, **options):
+        while True:
+            posts, subreddits = refresh_popular()
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{posts} popular post(s), lists for {subreddits} "
+                    "subreddit(s)"
+                )
+            )
+
+            if options["once"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,80 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from post.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute `Post.comment_count`, `Comment.reply_count` and "
+        "`Comment.descendant_count` and fix the rows that drifted"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--post",
+            dest="posts",
+            action="append",
+            help="Slug of a post to repair (repeatable), defaults to all",
+        )
+        parser.add_argument("--chunk-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        posts = Post.objects.order_by("pk")
+        if options["posts"]:
+            posts = posts.filter(slug__in=options["posts"])
+
+        posts = posts.annotate(actual=Count("comments")).values_list(
+            "pk", "comment_count", "actual"
+        )
+
+        repaired_posts = repaired_comments = 0
+        for post_id, comment_count, actual in posts.iterator(
+            chunk_size=options["chunk_size"]
+        ):
+            with transaction.atomic():
+                if comment_count != actual:
+                    Post.objects.filter(pk=post_id).update(comment_count=actual)
+                    repaired_posts += 1
+                if actual:
+                    repaired_comments += self.repair_thread(post_id)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Repaired {repaired_posts} post(s) and "
+                f"{repaired_comments} comment(s)"
+            )
+        )
+
+    def repair_thread(self, post_id: int) -> int:
+        """Recount a post's comments from one read of its thread"""
+
+        comments = list(
+            Comment.objects.filter(post_id=post_id)
+            .select_for_update()
+            .only("pk", "parent_id", "path", "reply_count", "descendant_count")
+        )
+
+        replies = dict.fromkeys((comment.pk for comment in comments), 0)
+        descendants = dict(replies)
+        for comment in comments:
+            if comment.parent_id is not None:
+                replies[comment.parent_id] += 1
+            for ancestor_id in Comment.get_path_ids(comment.path)[1:]:
+                descendants[ancestor_id] += 1
+
+        drifted = []
+        for comment in comments:
+            if (
+                comment.reply_count != replies[comment.pk]
+                or comment.descendant_count != descendants[comment.pk]
+            ):
+                comment.reply_count = replies[comment.pk]
+                comment.descendant_count = descendants[comment.pk]
+                drifted.append(comment)
+
+        Comment.objects.bulk_update(
+            drifted, fields=["reply_count", "descendant_count"], batch_size=500
+        )
+        return len(drifted)
@@ -0,0 +1,71 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from post.models import CommentVoteShard, PostVoteShard
+from post.votes import add_vote_counts
+
+
+class Command(BaseCommand):
+    help = (
+        "Fold pending vote shards into the `score`, `upvotes` and "
+        "`downvotes` of posts and comments. Meant to be run periodically."
+    )
+
+    shard_models = (PostVoteShard, CommentVoteShard)
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        for model in self.shard_models:
+            folded = 0
+            while shards := self.rollup(model, options["chunk_size"]):
+                folded += shards
+
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Folded {folded} {model._meta.verbose_name_plural}"
+                )
+            )
+
+    @transaction.atomic
+    def rollup(self, model, chunk_size: int) -> int:
+        """
+        Fold one chunk of non empty shards into their items and reset them.
+        The shards stay locked until the transaction ends, so no vote added
+        in the meantime can be lost.
+        """
+
+        item_field = self.get_item_field(model)
+        shards = list(
+            model.objects.exclude(upvotes=0, downvotes=0)
+            .select_for_update()
+            .order_by(item_field.attname, "shard")
+            .values_list("pk", item_field.attname, "upvotes", "downvotes")[
+                :chunk_size
+            ]
+        )
+        if not shards:
+            return 0
+
+        totals = {}
+        for _, item_id, upvotes, downvotes in shards:
+            item_upvotes, item_downvotes = totals.get(item_id, (0, 0))
+            totals[item_id] = (
+                item_upvotes + upvotes,
+                item_downvotes + downvotes,
+            )
+
+        add_vote_counts(item_field.related_model, totals)
+        model.objects.filter(pk__in=[shard[0] for shard in shards]).update(
+            upvotes=0, downvotes=0
+        )
+        return len(shards)
+
+    @staticmethod
+    def get_item_field(model):
+        """Foreign key of the shard to the post or comment it counts for"""
+
+        return next(
+            field for field in model._meta.concrete_fields if field.is_relation
+        )
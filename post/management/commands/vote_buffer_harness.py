@@ -0,0 +1,134 @@
+import random
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count, Q
+
+from post.models import Post
+from post.votes import enqueue_vote, flush_vote_buffer, get_vote_counts
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive the vote buffer with concurrent writers and flushers on one "
+        "post, then check the stored votes and counters. Creates "
+        "`vote-harness-<n>` users, so run it against a development database. "
+        "Needs a database with row level locks such as PostgreSQL, SQLite "
+        "rejects concurrent write transactions with 'database is locked'."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("post", help="Slug of the post to vote on")
+        parser.add_argument("--writers", type=int, default=8)
+        parser.add_argument("--flushers", type=int, default=2)
+        parser.add_argument("--users", type=int, default=50)
+        parser.add_argument(
+            "--votes", type=int, default=200, help="Votes cast per writer"
+        )
+        parser.add_argument("--batch-size", type=int, default=50)
+
+    def handle(self, *args, **options):
+        try:
+            post = Post.objects.get(slug=options["post"])
+        except Post.DoesNotExist:
+            raise CommandError(f"Post '{options['post']}' does not exist")
+
+        users = [
+            User.objects.get_or_create(
+                username=f"vote-harness-{index}",
+                defaults={"email": f"vote-harness-{index}@example.com"},
+            )[0]
+            for index in range(options["users"])
+        ]
+
+        intents = []
+        errors = []
+        writing = threading.Event()
+        writing.set()
+
+        def writer():
+            try:
+                for _ in range(options["votes"]):
+                    intent = enqueue_vote(
+                        post, random.choice(users), random.choice((1, 0, -1))
+                    )
+                    intents.append((intent.pk, intent.user_id, intent.value))
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connection.close()
+
+        def flusher():
+            try:
+                while writing.is_set() or post.vote_intents.exists():
+                    if not flush_vote_buffer(Post, options["batch_size"]):
+                        time.sleep(0.01)
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connection.close()
+
+        writers = [
+            threading.Thread(target=writer) for _ in range(options["writers"])
+        ]
+        flushers = [
+            threading.Thread(target=flusher) for _ in range(options["flushers"])
+        ]
+
+        started = time.perf_counter()
+        for thread in (*writers, *flushers):
+            thread.start()
+        for thread in writers:
+            thread.join()
+        writing.clear()
+        for thread in flushers:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        if errors:
+            raise CommandError(
+                f"{len(errors)} thread(s) failed, first error: {errors[0]!r}"
+            )
+
+        self.stdout.write(
+            f"{len(intents)} vote(s) from {options['writers']} writer(s) "
+            f"applied by {options['flushers']} flusher(s) in {elapsed:.2f}s"
+        )
+        self.verify(post, users, intents)
+
+    def verify(self, post: Post, users: list[User], intents: list) -> None:
+        expected = {}
+        for _, user_id, value in sorted(intents):
+            expected[user_id] = value
+
+        stored = dict(
+            post.votes.filter(user__in=users).values_list("user_id", "value")
+        )
+        wrong = [
+            user_id
+            for user_id, value in expected.items()
+            if stored.get(user_id, 0) != value
+        ]
+
+        post.refresh_from_db()
+        actual = post.votes.aggregate(
+            upvotes=Count("pk", filter=Q(value=1)),
+            downvotes=Count("pk", filter=Q(value=-1)),
+        )
+        counts = get_vote_counts(post)
+
+        if wrong or any(counts[key] != actual[key] for key in actual):
+            raise CommandError(
+                f"Mismatch: {len(wrong)} vote(s) differ from the last intent, "
+                f"counters {counts} vs votes {actual}"
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"OK: {len(expected)} user vote(s) match their last intent, "
+                f"counters {counts}"
+            )
+        )
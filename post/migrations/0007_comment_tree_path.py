@@ -0,0 +1,67 @@
+# Generated by Django 4.2.11 on 2026-10-18 19:23
+
+from django.db import migrations, models
+
+
+PATH_STEP = 16
+
+
+def backfill_comment_paths(apps, schema_editor):
+    Comment = apps.get_model("post", "Comment")
+
+    parents = dict(Comment.objects.values_list("id", "parent_id"))
+    paths = {}
+
+    def get_path(comment_id):
+        # Walk up iteratively to stay clear of the recursion limit on
+        # deep threads
+        chain = []
+        while comment_id is not None and comment_id not in paths:
+            chain.append(comment_id)
+            comment_id = parents[comment_id]
+
+        prefix = paths.get(comment_id, "")
+        for pk in reversed(chain):
+            prefix += format(pk, f"0{PATH_STEP}x")
+            paths[pk] = prefix
+        return prefix
+
+    comments = []
+    for pk in parents:
+        path = get_path(pk)
+        comments.append(
+            Comment(id=pk, path=path, depth=len(path) // PATH_STEP - 1)
+        )
+
+    Comment.objects.bulk_update(
+        comments, fields=["path", "depth"], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("post", "0006_alter_post_slug"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="depth",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="path",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.RunPython(
+            code=backfill_comment_paths,
+            reverse_code=migrations.RunPython.noop,
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["post", "path"], name="post_comment_post_path_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.11 on 2026-10-18 19:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("post", "0007_comment_tree_path"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["post", "parent", "created"],
+                name="post_comment_post_parent_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                condition=models.Q(("parent__isnull", True)),
+                fields=["post", "created", "id"],
+                name="post_comment_top_level_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.11 on 2026-10-18 19:31
+
+from django.db import migrations, models
+from django.db.models import Q
+
+
+PATH_STEP = 16
+
+
+def get_path_upper_bound(path):
+    head, last = path[:-PATH_STEP], int(path[-PATH_STEP:], 16)
+    return head + format(last + 1, f"0{PATH_STEP}x")
+
+
+def backfill_thread_locked(apps, schema_editor):
+    Comment = apps.get_model("post", "Comment")
+
+    roots = list(
+        Comment.objects.filter(locked=True).values_list("post_id", "path")
+    )
+    for start in range(0, len(roots), 500):
+        query = Q()
+        for post_id, path in roots[start : start + 500]:
+            query |= Q(
+                post_id=post_id,
+                path__gte=path,
+                path__lt=get_path_upper_bound(path),
+            )
+        Comment.objects.filter(query).update(thread_locked=True)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("post", "0008_comment_post_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="thread_locked",
+            field=models.BooleanField(
+                default=False,
+                editable=False,
+                verbose_name="Is locked by thread?",
+            ),
+        ),
+        migrations.RunPython(
+            code=backfill_thread_locked,
+            reverse_code=migrations.RunPython.noop,
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.11 on 2026-10-18 19:34
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Post = apps.get_model("post", "Post")
+    Comment = apps.get_model("post", "Comment")
+
+    def count_of(queryset):
+        return Coalesce(
+            Subquery(
+                queryset.order_by()
+                .values("post")
+                .annotate(count=Count("pk"))
+                .values("count")[:1]
+            ),
+            0,
+        )
+
+    Post.objects.update(
+        comment_count=count_of(Comment.objects.filter(post=OuterRef("pk")))
+    )
+    Comment.objects.update(
+        reply_count=count_of(Comment.objects.filter(parent=OuterRef("pk"))),
+        descendant_count=count_of(
+            Comment.objects.filter(
+                post=OuterRef("post"), path__startswith=OuterRef("path")
+            ).exclude(pk=OuterRef("pk"))
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("post", "0009_comment_thread_locked"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="descendant_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="reply_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="comment_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(
+            code=backfill_counters,
+            reverse_code=migrations.RunPython.noop,
+        ),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 4.2.11 on 2026-10-18 19:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("post", "0012_vote_intents"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="best_rank",
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="controversial_rank",
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="hot_rank",
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="random_rank",
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="ranked_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="rising_rank",
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                fields=["subreddit", "-created", "-id"], name="post_post_new_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                fields=["subreddit", "-best_rank", "-id"], name="post_post_best_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                fields=["subreddit", "-hot_rank", "-id"], name="post_post_hot_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                fields=["subreddit", "-rising_rank", "-id"], name="post_post_rising_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                fields=["subreddit", "-controversial_rank", "-id"],
+                name="post_post_controversial_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                fields=["subreddit", "-random_rank", "-id"], name="post_post_random_idx"
+            ),
+        ),
+    ]
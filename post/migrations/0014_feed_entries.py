@@ -0,0 +1,87 @@
+# Generated by Django 4.2.11 on 2026-10-18 19:38
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("subreddit", "0009_subreddit_member_count"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("post", "0013_post_ranks"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FeedEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created", models.DateTimeField()),
+            ],
+            options={
+                "verbose_name": "Feed Entry",
+                "verbose_name_plural": "Feed Entries",
+            },
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="fanned_out_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("fanned_out_at__isnull", True)),
+                fields=["id"],
+                name="post_post_fan_out_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="feedentry",
+            name="post",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="feed_entries",
+                to="post.post",
+            ),
+        ),
+        migrations.AddField(
+            model_name="feedentry",
+            name="subreddit",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to="subreddit.subreddit",
+            ),
+        ),
+        migrations.AddField(
+            model_name="feedentry",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="feed_entries",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="feedentry",
+            index=models.Index(
+                fields=["user", "-created", "-post"],
+                name="post_feedentry_timeline_idx",
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="feedentry",
+            unique_together={("user", "post")},
+        ),
+    ]
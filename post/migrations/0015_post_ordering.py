@@ -0,0 +1,21 @@
+# Generated by Django 4.2.11 on 2026-10-18 19:40
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("post", "0014_feed_entries"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="post",
+            options={
+                "ordering": ("-created", "-id"),
+                "verbose_name": "Post",
+                "verbose_name_plural": "Posts",
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.11 on 2026-10-18 19:44
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("post", "0015_post_ordering"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EngagementBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("start", models.DateTimeField()),
+                ("views", models.IntegerField(default=0)),
+                ("votes", models.IntegerField(default=0)),
+                ("comments", models.IntegerField(default=0)),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="engagement",
+                        to="post.post",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Engagement Bucket",
+                "verbose_name_plural": "Engagement Buckets",
+                "indexes": [
+                    models.Index(fields=["start"], name="post_engagement_start_idx")
+                ],
+                "unique_together": {("post", "start")},
+            },
+        ),
+    ]
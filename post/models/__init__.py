@@ -0,0 +1,26 @@
+from .comment import Comment, CommentQuerySet
+from .feed import FeedEntry
+from .post import Post
+from .trending import EngagementBucket
+from .vote import (
+    CommentVote,
+    CommentVoteIntent,
+    CommentVoteShard,
+    PostVote,
+    PostVoteIntent,
+    PostVoteShard,
+)
+
+__all__ = (
+    "Comment",
+    "CommentQuerySet",
+    "CommentVote",
+    "CommentVoteIntent",
+    "CommentVoteShard",
+    "EngagementBucket",
+    "FeedEntry",
+    "Post",
+    "PostVote",
+    "PostVoteIntent",
+    "PostVoteShard",
+)
@@ -0,0 +1,366 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Iterable
+
+from django.db import models
+from django.db.models import Case, F, Q, Value, When
+from django.db.models.functions import Concat, Substr
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from django_lifecycle import (
+    AFTER_CREATE,
+    AFTER_UPDATE,
+    BEFORE_CREATE,
+    BEFORE_DELETE,
+    LifecycleModelMixin,
+    hook,
+)
+
+from common.constants import CommentTreeConstants
+from core.models import BaseModel
+from subreddit.models import Moderator
+from users.models import User
+
+from .post import Post
+from .trending import EngagementBucket
+
+if TYPE_CHECKING:
+    from django.db.models import Manager
+
+    from .vote import CommentVote, CommentVoteIntent, CommentVoteShard
+
+
+class CommentQuerySet(models.QuerySet):
+    def subtree(self, comment: "Comment", include_self: bool = True):
+        """Comments under `comment` (depth first) in a single range scan"""
+
+        lookup = "path__gte" if include_self else "path__gt"
+        return self.filter(
+            post_id=comment.post_id,
+            **{lookup: comment.path},
+            path__lt=Comment.get_path_upper_bound(comment.path),
+        ).order_by("path")
+
+    def subtrees(
+        self,
+        roots: Iterable[tuple[int, str]],
+        max_depth=None,
+        include_self: bool = False,
+    ):
+        """Descendants of every `(post_id, path)` root in one query"""
+
+        lookup = "path__gte" if include_self else "path__gt"
+        query = Q()
+        for post_id, path in roots:
+            query |= Q(
+                post_id=post_id,
+                **{lookup: path},
+                path__lt=Comment.get_path_upper_bound(path),
+            )
+
+        if not query:
+            return self.none()
+
+        queryset = self.filter(query)
+        if max_depth is not None:
+            queryset = queryset.filter(depth__lte=max_depth)
+        return queryset.order_by("path")
+
+    def thread(self, post: "Post"):
+        """Every comment of a post in depth first order"""
+
+        return self.filter(post=post).order_by("path")
+
+    def is_thread_locked(self, comment_id: int) -> bool:
+        """Whether the comment or any of its ancestors is locked"""
+
+        return bool(
+            self.filter(pk=comment_id)
+            .values_list("thread_locked", flat=True)
+            .first()
+        )
+
+    def lock_threads(self, **fields) -> int:
+        """Lock the comments and push the lock down to their replies"""
+
+        roots = list(self.values_list("post_id", "path"))
+        updated = self.update(locked=True, thread_locked=True, **fields)
+        self.model.objects.subtrees(roots).update(thread_locked=True)
+        return updated
+
+    def unlock_threads(self, **fields) -> int:
+        """Unlock the comments and lift the lock they passed down"""
+
+        roots = list(self.values_list("post_id", "path"))
+        updated = self.update(locked=False, **fields)
+        self.model.objects.refresh_thread_locks(roots)
+        return updated
+
+    def refresh_thread_locks(self, roots: Iterable[tuple[int, str]]) -> None:
+        """
+        Recompute `thread_locked` for every comment below (and including)
+        each `(post_id, path)` root with a fixed number of statements.
+        """
+
+        roots = list(roots)
+        ancestor_ids = {
+            pk for _, path in roots for pk in Comment.get_path_ids(path)[1:]
+        }
+        locked_ancestors = set(
+            self.filter(id__in=ancestor_ids, locked=True).values_list(
+                "id", flat=True
+            )
+        )
+
+        inherited, cleared = [], []
+        for post_id, path in roots:
+            if locked_ancestors.intersection(Comment.get_path_ids(path)[1:]):
+                inherited.append((post_id, path))
+            else:
+                cleared.append((post_id, path))
+
+        if inherited:
+            self.subtrees(inherited, include_self=True).update(
+                thread_locked=True
+            )
+
+        if cleared:
+            self.subtrees(cleared, include_self=True).update(
+                thread_locked=False
+            )
+            still_locked = list(
+                self.subtrees(cleared, include_self=True)
+                .filter(locked=True)
+                .values_list("post_id", "path")
+            )
+            self.subtrees(still_locked, include_self=True).update(
+                thread_locked=True
+            )
+
+
+class Comment(LifecycleModelMixin, BaseModel):
+    user = models.ForeignKey(
+        to=User, on_delete=models.SET_NULL, related_name="comments", null=True
+    )
+    post = models.ForeignKey(
+        to=Post, on_delete=models.CASCADE, related_name="comments"
+    )
+
+    parent = models.ForeignKey(
+        to="self",
+        on_delete=models.CASCADE,
+        related_name="children",
+        blank=True,
+        null=True,
+    )
+    text = models.TextField()
+
+    edited_at = models.DateTimeField(
+        verbose_name=_("Comment edited at"), blank=True, null=True
+    )
+    locked = models.BooleanField(
+        verbose_name=_("Is thread locked?"), default=False
+    )
+    # Set when the comment or any of its ancestors is locked
+    thread_locked = models.BooleanField(
+        verbose_name=_("Is locked by thread?"), default=False, editable=False
+    )
+    last_locked_by = models.ForeignKey(
+        to=Moderator,
+        on_delete=models.SET_NULL,
+        related_name="locked_comments",
+        blank=True,
+        null=True,
+    )
+    last_locked_at = models.DateTimeField(blank=True, null=True)
+
+    last_unlocked_by = models.ForeignKey(
+        to=Moderator,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+    )
+    last_unlocked_at = models.DateTimeField(blank=True, null=True)
+
+    # Materialized path of the comment in its post's comment tree
+    path = models.TextField(editable=False, blank=True, default="")
+    depth = models.PositiveIntegerField(editable=False, default=0)
+
+    reply_count = models.IntegerField(default=0, editable=False)
+    descendant_count = models.IntegerField(default=0, editable=False)
+
+    # Folded in from `vote_shards` by the `rollup_vote_counters` command
+    score = models.IntegerField(default=0, editable=False)
+    upvotes = models.IntegerField(default=0, editable=False)
+    downvotes = models.IntegerField(default=0, editable=False)
+
+    # saved = GenericRelation(to=Saved, related_query_name="saved_comments")
+
+    objects = CommentQuerySet.as_manager()
+
+    # pinned: Manager["PinnedComment"]
+    children: Manager["Comment"]
+    votes: Manager["CommentVote"]
+    vote_shards: Manager["CommentVoteShard"]
+    vote_intents: Manager["CommentVoteIntent"]
+
+    class Meta:
+        verbose_name = _("Comment")
+        verbose_name_plural = _("Comments")
+        indexes = [
+            models.Index(
+                fields=["post", "path"], name="post_comment_post_path_idx"
+            ),
+            models.Index(
+                fields=["post", "parent", "created"],
+                name="post_comment_post_parent_idx",
+            ),
+            models.Index(
+                fields=["post", "created", "id"],
+                name="post_comment_top_level_idx",
+                condition=Q(parent__isnull=True),
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.post.subreddit} || {self.post} - {self.id}"
+
+    @hook(hook=BEFORE_CREATE)
+    def post_after_create(self) -> None:
+        if self.post.subreddit.comments_locked_by_default is True:
+            self.locked = True
+            self.last_locked_at = timezone.now()
+
+        parent_locked = self.parent_id is not None and self.parent.thread_locked
+        self.thread_locked = self.locked or parent_locked
+
+    @hook(hook=AFTER_CREATE)
+    def set_tree_path(self) -> None:
+        parent_path = self.parent.path if self.parent_id is not None else ""
+        self.path = parent_path + self.encode_path_segment(self.pk)
+        self.depth = self.get_depth(self.path)
+        Comment.objects.filter(pk=self.pk).update(
+            path=self.path, depth=self.depth
+        )
+
+    @hook(hook=AFTER_CREATE)
+    def increment_counters(self) -> None:
+        Post.objects.filter(pk=self.post_id).update(
+            comment_count=F("comment_count") + 1
+        )
+        EngagementBucket.record(self.post_id, comments=1)
+        if self.parent_id is not None:
+            self._update_ancestor_counters(
+                ancestor_ids=self.get_path_ids(self.parent.path),
+                parent_id=self.parent_id,
+                delta=1,
+            )
+
+    @hook(hook=BEFORE_DELETE)
+    def decrement_counters(self) -> None:
+        # Replies go with the comment through the cascade
+        removed = 1 + self.descendant_count
+        Post.objects.filter(pk=self.post_id).update(
+            comment_count=F("comment_count") - removed
+        )
+        if self.parent_id is not None:
+            self._update_ancestor_counters(
+                ancestor_ids=self.get_path_ids(self.path)[1:],
+                parent_id=self.parent_id,
+                delta=-removed,
+            )
+
+    @staticmethod
+    def _update_ancestor_counters(ancestor_ids, parent_id, delta: int) -> None:
+        """Add `delta` descendants to every ancestor and a reply to parent"""
+
+        reply_delta = 1 if delta > 0 else -1
+        Comment.objects.filter(pk__in=ancestor_ids).update(
+            descendant_count=F("descendant_count") + delta,
+            reply_count=Case(
+                When(pk=parent_id, then=F("reply_count") + reply_delta),
+                default=F("reply_count"),
+            ),
+        )
+
+    @hook(hook=AFTER_UPDATE, when="parent", has_changed=True)
+    def move_subtree(self) -> None:
+        """Rewrite the path of the comment and all of its descendants"""
+
+        old_path = self.path
+        parent_path = self.parent.path if self.parent_id is not None else ""
+        new_path = parent_path + self.encode_path_segment(self.pk)
+
+        Comment.objects.filter(
+            post_id=self.post_id,
+            path__gte=old_path,
+            path__lt=self.get_path_upper_bound(old_path),
+        ).update(
+            path=Concat(
+                Value(new_path),
+                Substr("path", len(old_path) + 1),
+                output_field=models.TextField(),
+            ),
+            depth=F("depth") + self.get_depth(new_path) - self.depth,
+        )
+        self.path = new_path
+        self.depth = self.get_depth(new_path)
+        Comment.objects.refresh_thread_locks([(self.post_id, new_path)])
+
+        moved = 1 + self.descendant_count
+        self._update_ancestor_counters(
+            ancestor_ids=self.get_path_ids(old_path)[1:],
+            parent_id=self.initial_value("parent"),
+            delta=-moved,
+        )
+        self._update_ancestor_counters(
+            ancestor_ids=self.get_path_ids(parent_path),
+            parent_id=self.parent_id,
+            delta=moved,
+        )
+
+    @hook(hook=AFTER_UPDATE, when="locked", has_changed=True)
+    def propagate_lock(self) -> None:
+        Comment.objects.refresh_thread_locks([(self.post_id, self.path)])
+        self.refresh_from_db(fields=["thread_locked"])
+
+    @staticmethod
+    def encode_path_segment(pk: int) -> str:
+        return format(pk, f"0{CommentTreeConstants.PATH_STEP}x")
+
+    @staticmethod
+    def get_path_ids(path: str) -> list[int]:
+        """Ids encoded in `path`, nearest first"""
+
+        step = CommentTreeConstants.PATH_STEP
+        return [
+            int(path[index - step : index], 16)
+            for index in range(len(path), 0, -step)
+        ]
+
+    @staticmethod
+    def get_depth(path: str) -> int:
+        return len(path) // CommentTreeConstants.PATH_STEP - 1
+
+    @staticmethod
+    def get_path_upper_bound(path: str) -> str:
+        """Smallest path that sorts after every descendant of `path`"""
+
+        step = CommentTreeConstants.PATH_STEP
+        head, last = path[:-step], int(path[-step:], 16)
+        return head + format(last + 1, f"0{step}x")
+
+    def get_children_map(self) -> dict[int, list[Comment]]:
+        """Descendants grouped by `parent_id`, fetched in one query"""
+
+        children_map = {}
+        for comment in Comment.objects.subtree(self, include_self=False):
+            children_map.setdefault(comment.parent_id, []).append(comment)
+        return children_map
+
+    def get_all_parents(self) -> list[int]:
+        """Ids of the comment and its ancestors, nearest first"""
+
+        if not self.path:
+            return [self.pk]
+        return self.get_path_ids(self.path)
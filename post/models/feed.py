@@ -0,0 +1,37 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from subreddit.models import Subreddit
+from users.models import User
+
+from .post import Post
+
+
+class FeedEntry(models.Model):
+    """
+    A post pushed into a user's home timeline by the `fan_out_feeds`
+    command. `created` is copied from the post so a timeline is read from
+    the `(user, -created, -post)` index alone.
+    """
+
+    user = models.ForeignKey(
+        to=User, on_delete=models.CASCADE, related_name="feed_entries"
+    )
+    post = models.ForeignKey(
+        to=Post, on_delete=models.CASCADE, related_name="feed_entries"
+    )
+    subreddit = models.ForeignKey(
+        to=Subreddit, on_delete=models.CASCADE, related_name="+"
+    )
+    created = models.DateTimeField()
+
+    class Meta:
+        verbose_name = _("Feed Entry")
+        verbose_name_plural = _("Feed Entries")
+        unique_together = ("user", "post")
+        indexes = [
+            models.Index(
+                fields=["user", "-created", "-post"],
+                name="post_feedentry_timeline_idx",
+            ),
+        ]
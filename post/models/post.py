@@ -0,0 +1,254 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+from django.contrib.contenttypes.fields import GenericRelation
+
+from django.core.cache import cache
+from django.db import IntegrityError, models, transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from django_lifecycle import (
+    AFTER_CREATE,
+    AFTER_DELETE,
+    AFTER_UPDATE,
+    BEFORE_CREATE,
+    LifecycleModelMixin,
+    hook,
+)
+
+from common.choices import FEED_ORDERINGS, POST_TYPES
+from common.constants import FeedConstants
+from common.utils import make_unique_slug
+from core.models import BaseModel
+from post.ranking import rank_rows
+from subreddit.models import Moderator, Subreddit
+from users.models import User  # , Saved
+
+if TYPE_CHECKING:
+    from django.db.models import Manager
+
+    from .comment import Comment
+    from .feed import FeedEntry
+    from .vote import PostVote, PostVoteIntent, PostVoteShard
+
+# Create your models here.
+
+# https://hub.steampipe.io/plugins/turbot/reddit/tables/reddit_my_comment
+
+
+class PostQuerySet(models.QuerySet):
+    # Stored column each feed ordering sorts on, highest first
+    rank_fields = {
+        FEED_ORDERINGS.new: "created",
+        FEED_ORDERINGS.best: "best_rank",
+        FEED_ORDERINGS.hot: "hot_rank",
+        FEED_ORDERINGS.rising: "rising_rank",
+        FEED_ORDERINGS.controversial: "controversial_rank",
+        FEED_ORDERINGS.random: "random_rank",
+    }
+
+    def ranked(self, ordering: str = FEED_ORDERINGS.new):
+        """Order by one of `FEED_ORDERINGS`, highest rank first"""
+
+        return self.order_by(f"-{self.rank_fields[ordering]}", "-id")
+
+
+class Post(LifecycleModelMixin, BaseModel):
+    user = models.ForeignKey(
+        to=User, on_delete=models.SET_NULL, related_name="posts", null=True
+    )
+    subreddit = models.ForeignKey(
+        to=Subreddit, on_delete=models.CASCADE, related_name="posts"
+    )
+    title = models.CharField(max_length=200)
+    body = models.TextField(blank=True, null=True)
+    slug = models.SlugField(
+        verbose_name=_("Post Slug"), max_length=250, unique=True
+    )
+
+    post_type = models.CharField(max_length=8, choices=POST_TYPES)
+
+    edited = models.DateTimeField(blank=True, null=True)
+
+    locked = models.BooleanField(
+        verbose_name=_("Is Post locked?"), default=False
+    )
+    last_locked_by = models.ForeignKey(
+        to=Moderator,
+        on_delete=models.SET_NULL,
+        related_name="locked_posts",
+        blank=True,
+        null=True,
+    )
+    last_locked_at = models.DateTimeField(blank=True, null=True)
+
+    last_unlocked_by = models.ForeignKey(
+        to=Moderator,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+    )
+    last_unlocked_at = models.DateTimeField(blank=True, null=True)
+
+    comment_count = models.IntegerField(default=0, editable=False)
+
+    # Folded in from `vote_shards` by the `rollup_vote_counters` command
+    score = models.IntegerField(default=0, editable=False)
+    upvotes = models.IntegerField(default=0, editable=False)
+    downvotes = models.IntegerField(default=0, editable=False)
+
+    # Recomputed in batches by the `rank_posts` command
+    hot_rank = models.FloatField(default=0, editable=False)
+    best_rank = models.FloatField(default=0, editable=False)
+    rising_rank = models.FloatField(default=0, editable=False)
+    controversial_rank = models.FloatField(default=0, editable=False)
+    random_rank = models.FloatField(default=0, editable=False)
+    ranked_at = models.DateTimeField(blank=True, null=True, editable=False)
+
+    # Set once the `fan_out_feeds` command pushed the post into home feeds
+    fanned_out_at = models.DateTimeField(blank=True, null=True, editable=False)
+
+    objects = PostQuerySet.as_manager()
+
+    # saved = GenericRelation(to=Saved, related_query_name="saved_posts")
+
+    # pinned: Manager["PinnedPost"]
+    # pinned_comments: Manager["PinnedComment"]
+    comments: Manager["Comment"]
+    feed_entries: Manager["FeedEntry"]
+    votes: Manager["PostVote"]
+    vote_shards: Manager["PostVoteShard"]
+    vote_intents: Manager["PostVoteIntent"]
+
+    class Meta:
+        verbose_name = _("Post")
+        verbose_name_plural = _("Posts")
+        ordering = ("-created", "-id")
+        indexes = [
+            models.Index(
+                fields=["subreddit", "-created", "-id"],
+                name="post_post_new_idx",
+            ),
+            models.Index(
+                fields=["subreddit", "-best_rank", "-id"],
+                name="post_post_best_idx",
+            ),
+            models.Index(
+                fields=["subreddit", "-hot_rank", "-id"],
+                name="post_post_hot_idx",
+            ),
+            models.Index(
+                fields=["subreddit", "-rising_rank", "-id"],
+                name="post_post_rising_idx",
+            ),
+            models.Index(
+                fields=["subreddit", "-controversial_rank", "-id"],
+                name="post_post_controversial_idx",
+            ),
+            models.Index(
+                fields=["subreddit", "-random_rank", "-id"],
+                name="post_post_random_idx",
+            ),
+            models.Index(
+                fields=["id"],
+                name="post_post_fan_out_idx",
+                condition=models.Q(fanned_out_at__isnull=True),
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.slug}"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            return super().save(*args, **kwargs)
+
+        # Slugs aren't checked before the insert, a taken one fails it and
+        # the post is inserted again with a unique suffix on its slug
+        try:
+            with transaction.atomic():
+                return super().save(*args, **kwargs)
+        except IntegrityError:
+            if not Post.objects.filter(slug=self.slug).exists():
+                raise
+
+        self.slug = make_unique_slug(self.slug)
+        return super().save(*args, **kwargs)
+
+    @hook(BEFORE_CREATE)
+    def set_initial_ranks(self):
+        """Rank new posts right away instead of waiting for `rank_posts`"""
+
+        now = timezone.now()
+        row = (
+            self.pk,
+            self.created,
+            self.score,
+            self.upvotes,
+            self.downvotes,
+            self.comment_count,
+        )
+        ranks = rank_rows([row], now=now)[0]
+        ranks.pop("pk")
+        for field, value in ranks.items():
+            setattr(self, field, value)
+        self.ranked_at = now
+
+    @hook(AFTER_CREATE)
+    @hook(AFTER_DELETE)
+    @hook(AFTER_UPDATE, when="post_type", has_changed=True)
+    def invalidate_recent_posts(self):
+        """Drop the subreddit's cached newest posts once this commits"""
+
+        key = FeedConstants.RECENT_POSTS_CACHE_KEY.format(self.subreddit_id)
+        transaction.on_commit(lambda: cache.delete(key))
+
+
+# class PinnedPost(BaseModel):
+#     subreddit = models.ForeignKey(
+#         to=Subreddit, on_delete=models.CASCADE, related_name="pinned_posts"
+#     )
+#     post = models.ForeignKey(to=Post, on_delete=models.CASCADE, related_name="pinned")
+#     pinned_by = models.ForeignKey(
+#         to=Moderator,
+#         on_delete=models.SET_NULL,
+#         related_name="pinned_posts",
+#         blank=True,
+#         null=True,
+#     )
+
+#     class Meta:
+#         verbose_name = _("Pinned Post")
+#         verbose_name_plural = _("Pinned Posts")
+
+
+# class PinnedComment(BaseModel):
+#     post = models.ForeignKey(
+#         to=Post, on_delete=models.CASCADE, related_name="pinned_comments"
+#     )
+#     comment = models.ForeignKey(
+#         to=Comment, on_delete=models.CASCADE, related_name="pinned"
+#     )
+#     pinned_by = models.ForeignKey(
+#         to=Moderator,
+#         on_delete=models.SET_NULL,
+#         related_name="pinned_comments",
+#         blank=True,
+#         null=True,
+#     )
+
+#     class Meta:
+#         verbose_name = _("Pinned Comment")
+#         verbose_name_plural = _("Pinned Comments")
+
+
+# class ReportedPost(BaseModel):
+#     user = models.ForeignKey(
+#         to=User, on_delete=models.SET_NULL, related_name="reported_posts", null=True
+#     )
+#     post = models.ForeignKey(to=Post, on_delete=models.CASCADE, related_name="reported")
+#     reason = models.CharField()
+
+#     class Meta:
+#         verbose_name = _("Reported Post")
+#         verbose_name_plural = _("Reported Posts")
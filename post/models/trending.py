@@ -0,0 +1,66 @@
+from datetime import datetime
+
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from common.constants import TrendingConstants
+
+from .post import Post
+
+
+class EngagementBucket(models.Model):
+    """
+    Engagement a post received during one time slice. The
+    `refresh_popular` command sums the slices of the sliding window into
+    the popular lists.
+    """
+
+    post = models.ForeignKey(
+        to=Post, on_delete=models.CASCADE, related_name="engagement"
+    )
+    start = models.DateTimeField()
+    views = models.IntegerField(default=0)
+    votes = models.IntegerField(default=0)
+    comments = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = _("Engagement Bucket")
+        verbose_name_plural = _("Engagement Buckets")
+        unique_together = ("post", "start")
+        indexes = [
+            models.Index(fields=["start"], name="post_engagement_start_idx")
+        ]
+
+    @staticmethod
+    def get_start(moment: datetime) -> datetime:
+        """Start of the slice `moment` falls in"""
+
+        minute = (
+            moment.minute - moment.minute % TrendingConstants.BUCKET_MINUTES
+        )
+        return moment.replace(minute=minute, second=0, microsecond=0)
+
+    @classmethod
+    def record(cls, post_id: int, **counts: int) -> None:
+        """Add `views`, `votes` and/or `comments` to the post's current slice"""
+
+        counts = {field: count for field, count in counts.items() if count}
+        if not counts:
+            return
+
+        start = cls.get_start(timezone.now())
+        increments = {
+            field: F(field) + count for field, count in counts.items()
+        }
+        bucket = cls.objects.filter(post_id=post_id, start=start)
+        if bucket.update(**increments):
+            return
+
+        try:
+            with transaction.atomic():
+                cls.objects.create(post_id=post_id, start=start, **counts)
+        except IntegrityError:
+            # Created by a concurrent request in the meantime
+            bucket.update(**increments)
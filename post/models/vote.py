@@ -0,0 +1,122 @@
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from common.choices import VOTE_TYPES
+from core.models import BaseModel
+from users.models import User
+
+from .comment import Comment
+from .post import Post
+
+
+class Vote(BaseModel):
+    user = models.ForeignKey(
+        to=User, on_delete=models.CASCADE, related_name="%(class)ss"
+    )
+    value = models.SmallIntegerField(choices=VOTE_TYPES)
+
+    class Meta:
+        abstract = True
+
+
+class PostVote(Vote):
+    post = models.ForeignKey(
+        to=Post, on_delete=models.CASCADE, related_name="votes"
+    )
+
+    class Meta:
+        verbose_name = _("Post Vote")
+        verbose_name_plural = _("Post Votes")
+        unique_together = ("user", "post")
+
+    def __str__(self) -> str:
+        return f"{self.user_id} -> {self.post_id} ({self.value:+d})"
+
+
+class CommentVote(Vote):
+    comment = models.ForeignKey(
+        to=Comment, on_delete=models.CASCADE, related_name="votes"
+    )
+
+    class Meta:
+        verbose_name = _("Comment Vote")
+        verbose_name_plural = _("Comment Votes")
+        unique_together = ("user", "comment")
+
+    def __str__(self) -> str:
+        return f"{self.user_id} -> {self.comment_id} ({self.value:+d})"
+
+
+class VoteShard(models.Model):
+    """
+    Pending counter deltas for one item. Votes add to a random shard so
+    concurrent voters rarely wait on the same row lock, and the shards are
+    periodically folded into the item's own counters and reset.
+    """
+
+    shard = models.PositiveSmallIntegerField()
+    upvotes = models.IntegerField(default=0)
+    downvotes = models.IntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+
+class PostVoteShard(VoteShard):
+    post = models.ForeignKey(
+        to=Post, on_delete=models.CASCADE, related_name="vote_shards"
+    )
+
+    class Meta:
+        verbose_name = _("Post Vote Shard")
+        verbose_name_plural = _("Post Vote Shards")
+        unique_together = ("post", "shard")
+
+
+class CommentVoteShard(VoteShard):
+    comment = models.ForeignKey(
+        to=Comment, on_delete=models.CASCADE, related_name="vote_shards"
+    )
+
+    class Meta:
+        verbose_name = _("Comment Vote Shard")
+        verbose_name_plural = _("Comment Vote Shards")
+        unique_together = ("comment", "shard")
+
+
+class VoteIntent(models.Model):
+    """
+    A vote waiting in the write-behind buffer. The `flush_vote_buffer`
+    command applies the latest intent of every user and item in batches.
+    """
+
+    user = models.ForeignKey(
+        to=User, on_delete=models.CASCADE, related_name="+"
+    )
+    # 0 withdraws the vote
+    value = models.SmallIntegerField()
+    created = models.DateTimeField(default=timezone.now, editable=False)
+
+    class Meta:
+        abstract = True
+
+
+class PostVoteIntent(VoteIntent):
+    post = models.ForeignKey(
+        to=Post, on_delete=models.CASCADE, related_name="vote_intents"
+    )
+
+    class Meta:
+        verbose_name = _("Post Vote Intent")
+        verbose_name_plural = _("Post Vote Intents")
+
+
+class CommentVoteIntent(VoteIntent):
+    comment = models.ForeignKey(
+        to=Comment, on_delete=models.CASCADE, related_name="vote_intents"
+    )
+
+    class Meta:
+        verbose_name = _("Comment Vote Intent")
+        verbose_name_plural = _("Comment Vote Intents")
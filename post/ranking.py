@@ -0,0 +1,81 @@
+import math
+import random
+from datetime import datetime
+
+# Rank formulas for the feed orderings. They are computed for whole batches of
+# posts by the `rank_posts` command and stored on `Post`, so listings sort on
+# an index instead of evaluating an expression per row.
+
+# Reddit's epoch for `hot`, an offset only keeps the numbers small
+HOT_EPOCH = 1134028003
+# Seconds it takes for a post to need 10 times the score to stay as hot
+HOT_DECAY = 45000
+
+# z for a 95% confidence interval used by `best`
+WILSON_Z = 1.96
+
+# Posts older than this don't rise anymore
+RISING_WINDOW_HOURS = 24
+RISING_GRAVITY = 1.5
+
+
+def hot(score: int, created: datetime) -> float:
+    order = math.log10(max(abs(score), 1))
+    sign = (score > 0) - (score < 0)
+    seconds = created.timestamp() - HOT_EPOCH
+    return round(sign * order + seconds / HOT_DECAY, 7)
+
+
+def best(upvotes: int, downvotes: int) -> float:
+    """Lower bound of the Wilson score interval of the upvote ratio"""
+
+    total = upvotes + downvotes
+    if total <= 0:
+        return 0.0
+
+    z = WILSON_Z
+    ratio = upvotes / total
+    left = ratio + z * z / (2 * total)
+    right = z * math.sqrt((ratio * (1 - ratio) + z * z / (4 * total)) / total)
+    return (left - right) / (1 + z * z / total)
+
+
+def controversial(upvotes: int, downvotes: int) -> float:
+    """Many votes, evenly split, rank highest"""
+
+    if upvotes <= 0 or downvotes <= 0:
+        return 0.0
+
+    magnitude = upvotes + downvotes
+    balance = min(upvotes, downvotes) / max(upvotes, downvotes)
+    return magnitude**balance
+
+
+def rising(score: int, comment_count: int, age_hours: float) -> float:
+    """Activity per hour of young posts"""
+
+    if age_hours >= RISING_WINDOW_HOURS:
+        return 0.0
+    return (score + comment_count) / (age_hours + 2) ** RISING_GRAVITY
+
+
+def rank_rows(rows, now: datetime) -> list[dict]:
+    """
+    Rank a batch of `(pk, created, score, upvotes, downvotes,
+    comment_count)` rows, returning the rank columns per row.
+    """
+
+    ranks = []
+    for pk, created, score, upvotes, downvotes, comment_count in rows:
+        age_hours = max((now - created).total_seconds(), 0) / 3600
+        ranks.append(
+            {
+                "pk": pk,
+                "hot_rank": hot(score, created),
+                "best_rank": best(upvotes, downvotes),
+                "rising_rank": rising(score, comment_count, age_hours),
+                "controversial_rank": controversial(upvotes, downvotes),
+                "random_rank": random.random(),
+            }
+        )
+    return ranks
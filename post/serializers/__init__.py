@@ -6,10 +6,12 @@ from .post_serializers import (
     PostCreateUpdateSerializer,
     PostDetailSerializer,
 )
+from .vote_serializers import VoteSerializer
 
 __all__ = (
     "CommentSerializer",
     "CommentCreateUpdateSerializer",
     "PostCreateUpdateSerializer",
     "PostDetailSerializer",
+    "VoteSerializer",
 )
@@ -46,8 +46,14 @@ class CommentSerializer(DynamicFieldsModelSerializer):
 
     @extend_schema_field(OpenApiTypes.OBJECT)
     def get_children(self, instance: Comment):
+        children_map = self.context.get("children_map")
+        if children_map is not None:
+            children = children_map.get(instance.pk, [])
+        else:
+            children = instance.children.all()
+
         return CommentSerializer(
-            instance.children.all(), many=True, read_only=True
+            children, many=True, read_only=True, context=self.context
         ).data
 
     class Meta:
@@ -59,6 +65,7 @@ class CommentSerializer(DynamicFieldsModelSerializer):
             "last_locked_by",
             "last_unlocked_at",
             "last_unlocked_by",
+            "path",
         )
         # depth = 3
 
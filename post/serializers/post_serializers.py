@@ -27,6 +27,8 @@ class PostListSerializer(DynamicFieldsModelSerializer):
             "slug",
             "post_type",
             "locked",
+            "comment_count",
+            "score",
             "created",
         )
 
@@ -59,6 +61,10 @@ class PostDetailSerializer(DynamicFieldsModelSerializer):
             "last_locked_by",
             "user",
             "subreddit",
+            "comment_count",
+            "score",
+            "upvotes",
+            "downvotes",
             # "comments",
         )
 
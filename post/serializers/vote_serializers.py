@@ -0,0 +1,15 @@
+from rest_framework import serializers
+
+from common.choices import VOTE_TYPES
+
+# Create your serializers here.
+
+
+class VoteSerializer(serializers.Serializer):
+    value = serializers.ChoiceField(
+        choices=[*VOTE_TYPES, (0, "Withdraw vote")],
+        help_text="1 to upvote, -1 to downvote, 0 to withdraw the vote",
+    )
+    score = serializers.IntegerField(read_only=True)
+    upvotes = serializers.IntegerField(read_only=True)
+    downvotes = serializers.IntegerField(read_only=True)
@@ -0,0 +1,289 @@
+from django.core import signing
+
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+from common.choices import COMMENT_SORT_TYPES
+from common.constants import CommentTreeConstants
+
+# Assemble comment threads from one flat fetch instead of walking
+# `Comment.children` per node.
+
+
+COMMENT_NODE_FIELDS = (
+    "id",
+    "post_id",
+    "parent_id",
+    "path",
+    "text",
+    "created",
+    "modified",
+    "edited_at",
+    "locked",
+    "thread_locked",
+    "last_locked_at",
+    "depth",
+    "reply_count",
+    "descendant_count",
+    "score",
+    "upvotes",
+    "downvotes",
+)
+
+CONTINUATION_TOKEN_SALT = "post.tree.more-replies"
+
+# Used only for formatting, so the output matches `CommentSerializer`
+datetime_field = serializers.DateTimeField()
+
+
+def format_datetime(value):
+    if value is None:
+        return None
+    return datetime_field.to_representation(value)
+
+
+def by_created(node) -> tuple:
+    return (node.created, node.id)
+
+
+class CommentNode:
+    """A comment row linked to its replies"""
+
+    __slots__ = COMMENT_NODE_FIELDS + ("children",)
+
+    def __init__(
+        self,
+        id,
+        post_id,
+        parent_id,
+        path,
+        text,
+        created,
+        modified,
+        edited_at,
+        locked,
+        thread_locked,
+        last_locked_at,
+        depth,
+        reply_count,
+        descendant_count,
+        score,
+        upvotes,
+        downvotes,
+    ) -> None:
+        self.id = id
+        self.post_id = post_id
+        self.parent_id = parent_id
+        self.path = path
+        self.text = text
+        self.created = created
+        self.modified = modified
+        self.edited_at = edited_at
+        self.locked = locked
+        self.thread_locked = thread_locked
+        self.last_locked_at = last_locked_at
+        self.depth = depth
+        self.reply_count = reply_count
+        self.descendant_count = descendant_count
+        self.score = score
+        self.upvotes = upvotes
+        self.downvotes = downvotes
+        self.children = []
+
+    def to_dict(self, children: list) -> dict:
+        return {
+            "id": self.id,
+            "children": children,
+            "text": self.text,
+            "created": format_datetime(self.created),
+            "modified": format_datetime(self.modified),
+            "edited_at": format_datetime(self.edited_at),
+            "locked": self.locked,
+            "thread_locked": self.thread_locked,
+            "last_locked_at": format_datetime(self.last_locked_at),
+            "depth": self.depth,
+            "reply_count": self.reply_count,
+            "descendant_count": self.descendant_count,
+            "score": self.score,
+            "upvotes": self.upvotes,
+            "downvotes": self.downvotes,
+        }
+
+
+class MoreReplies:
+    """Stub standing in for replies that were cut off"""
+
+    __slots__ = ("parent_id", "count", "token")
+
+    def __init__(self, parent_id, count: int, token: str) -> None:
+        self.parent_id = parent_id
+        self.count = count
+        self.token = token
+
+    def to_dict(self) -> dict:
+        return {
+            "kind": "more",
+            "parent": self.parent_id,
+            "count": self.count,
+            "token": self.token,
+        }
+
+
+class CommentTreeBuilder:
+    """
+    Links flat comment rows into nested nodes and renders them.
+
+    `depth` is the number of levels rendered, `limit` the number of replies
+    rendered per comment. Anything beyond either is replaced by a
+    `MoreReplies` stub whose token resumes from where the cut happened.
+    """
+
+    sort_keys = {
+        COMMENT_SORT_TYPES.new: by_created,
+        COMMENT_SORT_TYPES.old: by_created,
+    }
+    sort_reversed = {
+        COMMENT_SORT_TYPES.new: True,
+        COMMENT_SORT_TYPES.old: False,
+    }
+    orderings = {
+        COMMENT_SORT_TYPES.new: ("-created", "-id"),
+        COMMENT_SORT_TYPES.old: ("created", "id"),
+    }
+
+    def __init__(
+        self,
+        depth: int = CommentTreeConstants.DEFAULT_DEPTH,
+        limit: int = CommentTreeConstants.DEFAULT_LIMIT,
+        sort: str = COMMENT_SORT_TYPES.new,
+    ) -> None:
+        self.depth = depth
+        self.limit = limit
+        self.sort = sort
+
+    @classmethod
+    def from_query_params(cls, query_params) -> "CommentTreeBuilder":
+        depth = cls._get_int_param(
+            query_params,
+            "depth",
+            CommentTreeConstants.DEFAULT_DEPTH,
+            CommentTreeConstants.MAX_DEPTH,
+        )
+        limit = cls._get_int_param(
+            query_params,
+            "limit",
+            CommentTreeConstants.DEFAULT_LIMIT,
+            CommentTreeConstants.MAX_LIMIT,
+        )
+        sort = query_params.get("sort", COMMENT_SORT_TYPES.new)
+
+        if sort not in COMMENT_SORT_TYPES:
+            raise ValidationError(
+                detail={"message": "`sort` must be a valid choice."}
+            )
+
+        return cls(depth=depth, limit=limit, sort=sort)
+
+    @staticmethod
+    def _get_int_param(query_params, name: str, default: int, maximum: int):
+        value = query_params.get(name, default)
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            value = 0
+
+        if value < 1:
+            raise ValidationError(
+                detail={"message": f"`{name}` must be a positive integer."}
+            )
+        return min(value, maximum)
+
+    @property
+    def ordering(self) -> tuple[str, str]:
+        """Database ordering of siblings matching `sort`"""
+
+        return self.orderings[self.sort]
+
+    def get_max_depth(self, base_depth: int) -> int:
+        """Deepest `Comment.depth` rendered below comments at `base_depth`"""
+
+        return base_depth + self.depth - 1
+
+    def link(self, rows) -> list[CommentNode]:
+        """Link rows to their parents, returning the nodes without one"""
+
+        nodes = {}
+        roots = []
+        for row in rows:
+            node = CommentNode(**row)
+            nodes[node.id] = node
+
+        for node in nodes.values():
+            parent = nodes.get(node.parent_id)
+            if parent is None:
+                roots.append(node)
+            else:
+                parent.children.append(node)
+
+        return roots
+
+    def render(
+        self, nodes: list[CommentNode], parent_id=None, offset: int = 0
+    ) -> list[dict]:
+        """
+        Render siblings and their replies. Top level comments
+        (`parent_id` is None) are paged by the view, so `limit` only
+        applies to replies.
+        """
+
+        return self._render(nodes, parent_id, offset, level=0)
+
+    def _render(self, nodes, parent_id, offset: int, level: int) -> list:
+        nodes = sorted(
+            nodes,
+            key=self.sort_keys[self.sort],
+            reverse=self.sort_reversed[self.sort],
+        )
+
+        if parent_id is None:
+            visible = nodes
+        else:
+            visible = nodes[offset : offset + self.limit]
+
+        rendered = []
+        for node in visible:
+            if not node.reply_count:
+                children = []
+            elif level + 1 < self.depth:
+                children = self._render(
+                    node.children, node.id, offset=0, level=level + 1
+                )
+            else:
+                children = [
+                    self.more_replies(node.id, node.reply_count).to_dict()
+                ]
+            rendered.append(node.to_dict(children))
+
+        remaining = len(nodes) - offset - len(visible)
+        if parent_id is not None and remaining > 0:
+            more = self.more_replies(
+                parent_id, remaining, offset=offset + len(visible)
+            )
+            rendered.append(more.to_dict())
+
+        return rendered
+
+    def more_replies(self, parent_id, count: int, offset: int = 0):
+        token = signing.dumps(
+            {"parent": parent_id, "offset": offset, "sort": self.sort},
+            salt=CONTINUATION_TOKEN_SALT,
+            compress=True,
+        )
+        return MoreReplies(parent_id=parent_id, count=count, token=token)
+
+    @staticmethod
+    def load_token(token: str) -> dict:
+        try:
+            return signing.loads(token, salt=CONTINUATION_TOKEN_SALT)
+        except signing.BadSignature:
+            raise ValidationError(detail={"message": "Invalid `token`."})
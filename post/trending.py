@@ -0,0 +1,248 @@
+import heapq
+from datetime import timedelta
+
+from django.core import signing
+from django.core.cache import cache
+from django.db.models import Case, F, IntegerField, Sum, Value, When
+from django.utils import timezone
+
+from rest_framework.exceptions import ValidationError
+
+from common.constants import TrendingConstants
+from post.models import EngagementBucket, Post
+
+# The popular feed. Engagement is counted in `EngagementBucket` slices, and
+# `refresh_popular` periodically sums the slices of the sliding window into a
+# global and a per subreddit top list kept in the cache. Views are too many
+# to write per request, they are counted in the cache and `refresh_popular`
+# folds them into the slices first.
+
+CURSOR_SALT = "post.trending.popular"
+
+
+def get_window_start():
+    return timezone.now() - timedelta(hours=TrendingConstants.WINDOW_HOURS)
+
+
+def get_slice_key(key_format: str, start, *args) -> str:
+    return key_format.format(int(start.timestamp()), *args)
+
+
+def count_view(post_id: int) -> None:
+    """Count a view of the post in the current slice, in the cache only"""
+
+    start = EngagementBucket.get_start(timezone.now())
+    key = get_slice_key(TrendingConstants.VIEW_COUNT_CACHE_KEY, start, post_id)
+    timeout = TrendingConstants.VIEWS_TIMEOUT
+
+    if not cache.add(key, 1, timeout=timeout):
+        try:
+            cache.incr(key)
+            return
+        except ValueError:
+            # Expired in the meantime, counted anew below
+            if not cache.add(key, 1, timeout=timeout):
+                return
+
+    # First view of the post in the slice, list it under the next number
+    viewed_key = get_slice_key(TrendingConstants.VIEWED_POSTS_CACHE_KEY, start)
+    cache.add(viewed_key, 0, timeout=timeout)
+    number = cache.incr(viewed_key)
+    cache.set(
+        get_slice_key(TrendingConstants.VIEWED_POST_CACHE_KEY, start, number),
+        post_id,
+        timeout=timeout,
+    )
+
+
+def fold_views() -> int:
+    """
+    Move the view counts of the window's slices from the cache into the
+    slices, returning the number of views moved
+    """
+
+    current = EngagementBucket.get_start(timezone.now())
+    slices = (
+        TrendingConstants.WINDOW_HOURS * 60 // TrendingConstants.BUCKET_MINUTES
+    )
+    starts = {}
+    for index in range(slices + 1):
+        start = current - timedelta(
+            minutes=index * TrendingConstants.BUCKET_MINUTES
+        )
+        key = get_slice_key(TrendingConstants.VIEWED_POSTS_CACHE_KEY, start)
+        starts[key] = start
+
+    folded = 0
+    for viewed_key, viewed in cache.get_many(list(starts)).items():
+        start = starts[viewed_key]
+        listing = [
+            get_slice_key(
+                TrendingConstants.VIEWED_POST_CACHE_KEY, start, number
+            )
+            for number in range(1, viewed + 1)
+        ]
+        keys = {
+            get_slice_key(
+                TrendingConstants.VIEW_COUNT_CACHE_KEY, start, post_id
+            ): post_id
+            for post_id in set(cache.get_many(listing).values())
+        }
+
+        views = {}
+        for key, count in cache.get_many(list(keys)).items():
+            if count:
+                # Views counted after the read are left in the cache
+                cache.decr(key, count)
+                views[keys[key]] = count
+        add_views(start, views)
+        folded += sum(views.values())
+
+        if start < current:
+            # Views only land in the current slice
+            cache.delete_many([viewed_key, *listing, *keys])
+    return folded
+
+
+def add_views(start, views: dict[int, int]) -> None:
+    """Add views per post id to the posts' slices starting at `start`"""
+
+    post_ids = list(
+        Post.objects.filter(pk__in=views).values_list("pk", flat=True)
+    )
+    if not post_ids:
+        return
+
+    EngagementBucket.objects.bulk_create(
+        [
+            EngagementBucket(post_id=post_id, start=start)
+            for post_id in post_ids
+        ],
+        ignore_conflicts=True,
+    )
+    EngagementBucket.objects.filter(start=start, post_id__in=post_ids).update(
+        views=F("views")
+        + Case(
+            *(
+                When(post_id=post_id, then=Value(views[post_id]))
+                for post_id in post_ids
+            ),
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+    )
+
+
+def compute_popular() -> tuple[list, dict[int, list]]:
+    """
+    Global and per subreddit `(id, post_type)` lists, best first, from the
+    engagement inside the window
+    """
+
+    scores = (
+        EngagementBucket.objects.filter(start__gte=get_window_start())
+        .values("post_id", "post__subreddit_id", "post__post_type")
+        .annotate(
+            score=Sum(
+                F("views") * TrendingConstants.VIEW_WEIGHT
+                + F("votes") * TrendingConstants.VOTE_WEIGHT
+                + F("comments") * TrendingConstants.COMMENT_WEIGHT
+            )
+        )
+        .values_list(
+            "score", "post_id", "post__subreddit_id", "post__post_type"
+        )
+    )
+
+    by_subreddit = {}
+    for row in scores.iterator(chunk_size=2000):
+        by_subreddit.setdefault(row[2], []).append(row)
+
+    def top(rows, count: int) -> list:
+        return [
+            (post_id, post_type)
+            for _, post_id, _, post_type in heapq.nlargest(count, rows)
+        ]
+
+    subreddits = {
+        subreddit_id: top(rows, TrendingConstants.SUBREDDIT_TOP)
+        for subreddit_id, rows in by_subreddit.items()
+    }
+    popular = top(
+        (row for rows in by_subreddit.values() for row in rows),
+        TrendingConstants.GLOBAL_TOP,
+    )
+    return popular, subreddits
+
+
+def refresh_popular() -> tuple[int, int]:
+    """
+    Fold the counted views into the slices, recompute the popular lists,
+    drop expired slices and cache the lists
+    """
+
+    fold_views()
+    EngagementBucket.objects.filter(start__lt=get_window_start()).delete()
+    popular, subreddits = compute_popular()
+
+    lists = {TrendingConstants.GLOBAL_CACHE_KEY: popular}
+    for subreddit_id, posts in subreddits.items():
+        lists[TrendingConstants.SUBREDDIT_CACHE_KEY.format(subreddit_id)] = (
+            posts
+        )
+
+    # Subreddits that dropped out of the window would keep their old list
+    stale = cache.get(TrendingConstants.SUBREDDITS_CACHE_KEY, [])
+    cache.delete_many(
+        [
+            TrendingConstants.SUBREDDIT_CACHE_KEY.format(subreddit_id)
+            for subreddit_id in set(stale) - set(subreddits)
+        ]
+    )
+    lists[TrendingConstants.SUBREDDITS_CACHE_KEY] = list(subreddits)
+
+    cache.set_many(lists, timeout=TrendingConstants.CACHE_TIMEOUT)
+    return len(popular), len(subreddits)
+
+
+def get_popular(subreddit_id: int | None = None) -> list[tuple[int, str]]:
+    """Cached `(id, post_type)` list of the popular feed, best first"""
+
+    if subreddit_id is None:
+        key = TrendingConstants.GLOBAL_CACHE_KEY
+    else:
+        key = TrendingConstants.SUBREDDIT_CACHE_KEY.format(subreddit_id)
+    return cache.get(key, [])
+
+
+def get_popular_page(
+    page_size: int,
+    subreddit_id: int | None = None,
+    post_type: str | None = None,
+    cursor: str | None = None,
+) -> tuple[list[Post], str | None]:
+    """A page of the popular feed, a cache read and a single `in_bulk`"""
+
+    offset = 0
+    if cursor:
+        try:
+            offset = int(signing.loads(cursor, salt=CURSOR_SALT)["offset"])
+        except (signing.BadSignature, KeyError, TypeError, ValueError):
+            raise ValidationError(detail={"message": "Invalid `cursor`."})
+
+    post_ids = [
+        post_id
+        for post_id, type_ in get_popular(subreddit_id)
+        if post_type is None or type_ == post_type
+    ]
+    keys = post_ids[offset : offset + page_size]
+
+    posts = Post.objects.select_related("user", "subreddit").in_bulk(keys)
+    page = [posts[post_id] for post_id in keys if post_id in posts]
+
+    next_cursor = None
+    if offset + page_size < len(post_ids):
+        next_cursor = signing.dumps(
+            {"offset": offset + page_size}, salt=CURSOR_SALT
+        )
+    return page, next_cursor
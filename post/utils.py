@@ -1,19 +1,67 @@
-from uuid import uuid4
+import json
+from typing import Iterable, Iterator
+
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils.text import slugify
 
-from post.models import Post
+from common.constants import CommentTreeConstants
+from common.utils import make_unique_slug
+from post.models import Comment, Post
+
+COMMENT_EXPORT_FIELDS = (
+    "id",
+    "parent_id",
+    "user_id",
+    "depth",
+    "text",
+    "created",
+    "modified",
+    "edited_at",
+    "locked",
+    "thread_locked",
+    "reply_count",
+    "descendant_count",
+    "score",
+)
 
 
 def make_post_slug(title: str) -> str:
-    slug = slugify(title)
-    if Post.objects.filter(slug=slug).exists():
-        while True:
-            random_slug = f"{slug}_{uuid4().hex[:6]}"
-
-            if Post.objects.filter(slug=random_slug).exists():
-                continue
-            else:
-                slug = random_slug
-                break
-
-    return slug
+    """
+    Slug of a post title. It isn't checked against existing posts, a taken
+    slug fails the insert and `Post.save` retries it with a unique suffix.
+    """
+
+    return slugify(title) or make_unique_slug("post")
+
+
+def make_post_slugs(titles: Iterable[str]) -> list[str]:
+    """Slugs for many titles, checked against existing posts in one query"""
+
+    slugs = [make_post_slug(title) for title in titles]
+    taken = set(
+        Post.objects.filter(slug__in=set(slugs)).values_list("slug", flat=True)
+    )
+
+    unique = []
+    for slug in slugs:
+        if slug in taken:
+            slug = make_unique_slug(slug)
+        taken.add(slug)
+        unique.append(slug)
+    return unique
+
+
+def export_comment_thread(post: Post) -> Iterator[str]:
+    """
+    Yield every comment of the post as one JSON line, depth first. Rows are
+    read through a server-side cursor so memory use does not grow with the
+    size of the thread.
+    """
+
+    comments = (
+        Comment.objects.thread(post)
+        .values(*COMMENT_EXPORT_FIELDS)
+        .iterator(chunk_size=CommentTreeConstants.EXPORT_CHUNK_SIZE)
+    )
+    for comment in comments:
+        yield json.dumps(comment, cls=DjangoJSONEncoder) + "\n"
@@ -1,27 +1,52 @@
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from django.http import StreamingHttpResponse
+
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
+from rest_framework.permissions import (
+    IsAdminUser,
+    IsAuthenticated,
+    IsAuthenticatedOrReadOnly,
+)
+from rest_framework.response import Response
+from rest_framework.status import HTTP_200_OK, HTTP_202_ACCEPTED
+from rest_framework.throttling import ScopedRateThrottle
 from rest_framework.viewsets import ModelViewSet
 
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 
+from common.choices import COMMENT_SORT_TYPES, FEED_ORDERINGS
 from common.mixins import (
+    PaginationActionClassMixin,
     SerializerActionClassMixin,
     PermissionActionClassMixin,
+    PreloadSerializerMixin,
+    SparseFieldsMixin,
+    SubredditContextMixin,
+    ValuesResponseMixin,
 )
 from common.permissions import (
     IsCommentLocked,
     IsPostLocked,
     IsSubredditMember,
+    IsSubredditOwnerOrModerator,
     IsUserBanned,
     IsUserTheOwner,
 )
+from core.pagination import PAGINATION_CHOICES
 from post.models import Comment, Post
 from post.serializers import (
     CommentSerializer,
     CommentCreateUpdateSerializer,
     PostCreateUpdateSerializer,
     PostDetailSerializer,
+    VoteSerializer,
 )
+from post.trending import count_view
+from post.tree import COMMENT_NODE_FIELDS, CommentTreeBuilder
+from post.utils import export_comment_thread
+from post.votes import get_vote_counts, submit_vote
 
 # Create your views here.
 
@@ -39,8 +64,13 @@ from post.serializers import (
 )
 class PostViewSet(
     # MultipleLookupFieldMixin,
+    PaginationActionClassMixin,
     PermissionActionClassMixin,
     SerializerActionClassMixin,
+    SubredditContextMixin,
+    PreloadSerializerMixin,
+    SparseFieldsMixin,
+    ValuesResponseMixin,
     ModelViewSet,
 ):
     """Post ViewSet"""
@@ -50,6 +80,7 @@ class PostViewSet(
         "list": PostDetailSerializer,
         "retrieve": PostDetailSerializer,
     }
+    pagination_choices = PAGINATION_CHOICES
     lookup_field = "slug"
     # lookup_fields = ("slug", "id", "pk")
     permission_classes = (IsAuthenticatedOrReadOnly,)
@@ -58,20 +89,53 @@ class PostViewSet(
         "update": (IsUserBanned, IsUserTheOwner, IsPostLocked),
         "partial_update": (IsUserBanned, IsUserTheOwner, IsPostLocked),
         "destroy": (IsUserBanned, IsUserTheOwner),
+        "vote": (IsAuthenticated, IsUserBanned, IsPostLocked),
+        # Streams the whole thread, kept to the subreddit's moderators
+        "export": (IsAuthenticated, IsAdminUser | IsSubredditOwnerOrModerator),
     }
+    # Rate of the actions throttled with `ScopedRateThrottle`
+    throttle_scope = "post_export"
 
     def get_queryset(self):
-        queryset = Post.objects.all()
+        if getattr(self, "swagger_fake_view", False):
+            return Post.objects.none()
 
+        # Posts are only reachable through their own subreddit, which the
+        # ban checks look at
+        queryset = Post.objects.filter(subreddit=self.get_subreddit())
         if self.action == "list":
-            queryset = queryset.filter(
-                subreddit__name=self.kwargs["subreddit_name"]
+            ordering = self.request.query_params.get(
+                "ordering", FEED_ORDERINGS.new
             )
+            if ordering not in FEED_ORDERINGS:
+                raise ValidationError(
+                    detail={"message": "`ordering` must be a valid choice."}
+                )
+            queryset = queryset.ranked(ordering)
         if self.action == "retrieve":
             queryset = queryset.prefetch_related("comments")
 
         return queryset
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="ordering",
+                type=OpenApiTypes.STR,
+                enum=list(dict(FEED_ORDERINGS)),
+            ),
+        ],
+    )
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.values_response(queryset)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        count_view(instance.pk)
+        serializer = self.get_serializer(instance)
+        return Response(data=serializer.data, status=HTTP_200_OK)
+
     def get_serializer(self, *args, **kwargs):
         exclude = []
         if self.action == "list":
@@ -81,6 +145,44 @@ class PostViewSet(
         kwargs["exclude"] = exclude
         return super().get_serializer(*args, **kwargs)
 
+    @extend_schema(responses={(200, "application/x-ndjson"): OpenApiTypes.STR})
+    @action(
+        methods=["GET"], detail=True, throttle_classes=(ScopedRateThrottle,)
+    )
+    def export(self, request, *args, **kwargs):
+        """Stream every comment of the post as newline delimited JSON"""
+
+        post: Post = self.get_object()
+        response = StreamingHttpResponse(
+            export_comment_thread(post), content_type="application/x-ndjson"
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{post.slug}-comments.ndjson"'
+        )
+        return response
+
+    @extend_schema(
+        request=VoteSerializer,
+        responses={200: VoteSerializer, 202: VoteSerializer},
+    )
+    @action(methods=["POST"], detail=True)
+    def vote(self, request, *args, **kwargs):
+        """Upvote, downvote or withdraw the vote on the post"""
+
+        post: Post = self.get_object()
+        serializer = VoteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        value = serializer.validated_data["value"]
+        buffered = submit_vote(post, request.user, value)
+
+        # Buffered votes show up in the counts once the buffer is flushed
+        serializer = VoteSerializer({"value": value, **get_vote_counts(post)})
+        return Response(
+            serializer.data,
+            status=HTTP_202_ACCEPTED if buffered else HTTP_200_OK,
+        )
+
     # @action(methods=["GET"], detail=True)
     # def comments(self, request, *args, **kwargs) -> Response:
     #     post: Post = self.get_object()
@@ -110,7 +212,13 @@ class PostViewSet(
     ],
 )
 class CommentViewSet(
-    PermissionActionClassMixin, SerializerActionClassMixin, ModelViewSet
+    PaginationActionClassMixin,
+    PermissionActionClassMixin,
+    SerializerActionClassMixin,
+    SubredditContextMixin,
+    PreloadSerializerMixin,
+    SparseFieldsMixin,
+    ModelViewSet,
 ):
     """Comment ViewSet"""
 
@@ -119,16 +227,32 @@ class CommentViewSet(
         "list": CommentSerializer,
         "retrieve": CommentSerializer,
     }
+    pagination_choices = PAGINATION_CHOICES
     permission_classes = (IsAuthenticatedOrReadOnly,)
     permission_action_classes = {
         "create": (IsUserBanned, IsCommentLocked),
         "update": (IsUserBanned, IsUserTheOwner, IsCommentLocked),
         "partial_update": (IsUserBanned, IsUserTheOwner, IsCommentLocked),
         "destroy": (IsUserBanned, IsUserTheOwner),
+        "vote": (IsAuthenticated, IsUserBanned, IsCommentLocked),
     }
 
+    def get_post(self) -> Post:
+        """Post from the URL, resolved once per request"""
+
+        if not hasattr(self, "_post"):
+            self._post = get_object_or_404(
+                Post.objects.only("id", "subreddit_id"),
+                slug=self.kwargs["posts_slug"],
+                subreddit=self.get_subreddit(),
+            )
+        return self._post
+
     def get_queryset(self):
-        queryset = Comment.objects.prefetch_related("children").all()
+        if getattr(self, "swagger_fake_view", False):
+            return Comment.objects.none()
+
+        queryset = Comment.objects.filter(post_id=self.get_post().pk)
 
         if self.action == "list":
             queryset = queryset.filter(parent__isnull=True)
@@ -138,10 +262,115 @@ class CommentViewSet(
     def get_serializer(self, *args, **kwargs):
         exclude = []
 
-        if self.action in ["list", "retrieve"]:
+        if self.action == "retrieve":
             children = self.request.query_params.get("children", False)
             if children is False:
                 exclude += ["children"]
 
         kwargs["exclude"] = exclude
         return super().get_serializer(*args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance: Comment = self.get_object()
+        context = self.get_serializer_context()
+
+        if self.request.query_params.get("children", False) is not False:
+            # Load the whole subtree with one range query on `path`
+            context["children_map"] = instance.get_children_map()
+
+        serializer = self.get_serializer(instance, context=context)
+        return Response(serializer.data)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(name="depth", type=OpenApiTypes.INT),
+            OpenApiParameter(name="limit", type=OpenApiTypes.INT),
+            OpenApiParameter(
+                name="sort",
+                type=OpenApiTypes.STR,
+                enum=list(dict(COMMENT_SORT_TYPES)),
+            ),
+        ],
+    )
+    def list(self, request, *args, **kwargs):
+        """
+        Top level comments of the post with their replies nested up to
+        `depth` levels and `limit` replies per comment
+        """
+
+        builder = CommentTreeBuilder.from_query_params(request.query_params)
+        queryset = (
+            self.filter_queryset(self.get_queryset())
+            .order_by(*builder.ordering)
+            .values(*COMMENT_NODE_FIELDS)
+        )
+
+        page = self.paginate_queryset(queryset)
+        roots = list(page if page is not None else queryset)
+
+        # Every reply below the page's comments comes from a single query
+        replies = Comment.objects.subtrees(
+            roots=((root["post_id"], root["path"]) for root in roots),
+            max_depth=builder.get_max_depth(base_depth=0),
+        ).values(*COMMENT_NODE_FIELDS)
+
+        data = builder.render(builder.link([*roots, *replies]))
+
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="token", type=OpenApiTypes.STR, required=True
+            ),
+            OpenApiParameter(name="depth", type=OpenApiTypes.INT),
+            OpenApiParameter(name="limit", type=OpenApiTypes.INT),
+        ],
+    )
+    @action(methods=["GET"], detail=False)
+    def more(self, request, *args, **kwargs):
+        """Replies hidden behind a `more` stub of the comment tree"""
+
+        builder = CommentTreeBuilder.from_query_params(request.query_params)
+        token = builder.load_token(request.query_params.get("token", ""))
+        builder.sort = token["sort"]
+
+        parent: Comment = get_object_or_404(
+            self.get_queryset(), pk=token["parent"]
+        )
+        replies = (
+            Comment.objects.subtree(parent, include_self=False)
+            .filter(depth__lte=builder.get_max_depth(parent.depth + 1))
+            .values(*COMMENT_NODE_FIELDS)
+        )
+
+        data = builder.render(
+            builder.link(replies), parent_id=parent.pk, offset=token["offset"]
+        )
+        return Response(data)
+
+    @extend_schema(
+        request=VoteSerializer,
+        responses={200: VoteSerializer, 202: VoteSerializer},
+    )
+    @action(methods=["POST"], detail=True)
+    def vote(self, request, *args, **kwargs):
+        """Upvote, downvote or withdraw the vote on the comment"""
+
+        comment: Comment = self.get_object()
+        serializer = VoteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        value = serializer.validated_data["value"]
+        buffered = submit_vote(comment, request.user, value)
+
+        # Buffered votes show up in the counts once the buffer is flushed
+        serializer = VoteSerializer(
+            {"value": value, **get_vote_counts(comment)}
+        )
+        return Response(
+            serializer.data,
+            status=HTTP_202_ACCEPTED if buffered else HTTP_200_OK,
+        )
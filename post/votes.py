@@ -0,0 +1,257 @@
+import random
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, IntegerField, Q, Sum, Value, When
+
+from post.models import (
+    Comment,
+    CommentVote,
+    CommentVoteIntent,
+    EngagementBucket,
+    Post,
+    PostVote,
+    PostVoteIntent,
+)
+from users.models import User
+
+# Votes on posts and comments. `PostVote`/`CommentVote` hold one row per user
+# and item, while the counters are accumulated in `*VoteShard` rows and folded
+# into the item by the `rollup_vote_counters` command.
+#
+# With `VOTE_WRITE_BEHIND` a vote is only appended to `*VoteIntent` and the
+# `flush_vote_buffer` command applies the buffer in batches.
+
+# Item model -> (vote model, intent model)
+VOTE_MODELS = {
+    Post: (PostVote, PostVoteIntent),
+    Comment: (CommentVote, CommentVoteIntent),
+}
+
+
+def get_vote_deltas(previous: int, value: int) -> tuple[int, int]:
+    """Change in (upvotes, downvotes) when a vote changes to `value`"""
+
+    upvotes = (value == 1) - (previous == 1)
+    downvotes = (value == -1) - (previous == -1)
+    return upvotes, downvotes
+
+
+def add_to_shard(item: Post | Comment, upvotes: int, downvotes: int) -> None:
+    """Add counter deltas to one of the item's shards, picked at random"""
+
+    if not (upvotes or downvotes):
+        return
+
+    shard = random.randrange(settings.VOTE_COUNTER_SHARDS)
+    deltas = {
+        "upvotes": F("upvotes") + upvotes,
+        "downvotes": F("downvotes") + downvotes,
+    }
+
+    if item.vote_shards.filter(shard=shard).update(**deltas):
+        return
+
+    try:
+        with transaction.atomic():
+            item.vote_shards.create(
+                shard=shard, upvotes=upvotes, downvotes=downvotes
+            )
+    except IntegrityError:
+        # Another voter created the shard in the meantime
+        item.vote_shards.filter(shard=shard).update(**deltas)
+
+
+@transaction.atomic
+def cast_vote(item: Post | Comment, user: User, value: int) -> int:
+    """
+    Record `user`'s vote on `item`, replacing any previous one. A `value`
+    of 0 withdraws the vote. Returns the previous value.
+    """
+
+    vote = item.votes.select_for_update().filter(user=user).first()
+    if vote is None and value:
+        # No row to lock on a first vote, so two of them can race to insert
+        try:
+            with transaction.atomic():
+                item.votes.create(user=user, value=value)
+        except IntegrityError:
+            # The other vote won, it's replaced below
+            vote = item.votes.select_for_update().get(user=user)
+        else:
+            count_vote(item, 0, value)
+            return 0
+
+    previous = vote.value if vote is not None else 0
+    if value == previous:
+        return previous
+
+    if value == 0:
+        vote.delete()
+    else:
+        vote.value = value
+        vote.save(update_fields=["value", "modified"])
+
+    count_vote(item, previous, value)
+    return previous
+
+
+def count_vote(item: Post | Comment, previous: int, value: int) -> None:
+    """Counter and engagement updates of a vote changing to `value`"""
+
+    add_to_shard(item, *get_vote_deltas(previous, value))
+    if isinstance(item, Post) and value:
+        EngagementBucket.record(item.pk, votes=1)
+
+
+def get_vote_counts(item: Post | Comment) -> dict[str, int]:
+    """Current counters of `item`, including deltas not yet rolled up"""
+
+    pending = item.vote_shards.aggregate(
+        upvotes=Sum("upvotes", default=0),
+        downvotes=Sum("downvotes", default=0),
+    )
+    upvotes = item.upvotes + pending["upvotes"]
+    downvotes = item.downvotes + pending["downvotes"]
+    return {
+        "score": upvotes - downvotes,
+        "upvotes": upvotes,
+        "downvotes": downvotes,
+    }
+
+
+def add_vote_counts(
+    item_model: type[Post | Comment], deltas: dict[int, tuple[int, int]]
+) -> None:
+    """Add (upvotes, downvotes) per item id to the items in one `UPDATE`"""
+
+    if not deltas:
+        return
+
+    def delta(index: int, sign: int = 1):
+        return Case(
+            *(
+                When(pk=item_id, then=Value(sign * counts[index]))
+                for item_id, counts in deltas.items()
+            ),
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+
+    item_model.objects.filter(pk__in=deltas).update(
+        upvotes=F("upvotes") + delta(0),
+        downvotes=F("downvotes") + delta(1),
+        score=F("score") + delta(0) + delta(1, sign=-1),
+    )
+
+
+def enqueue_vote(item: Post | Comment, user: User, value: int):
+    """Append a vote to the write-behind buffer"""
+
+    return item.vote_intents.create(user=user, value=value)
+
+
+def submit_vote(item: Post | Comment, user: User, value: int) -> bool:
+    """Cast or buffer a vote depending on `VOTE_WRITE_BEHIND`"""
+
+    if settings.VOTE_WRITE_BEHIND:
+        enqueue_vote(item, user, value)
+        return True
+
+    cast_vote(item, user, value)
+    return False
+
+
+@transaction.atomic
+def flush_vote_buffer(item_model: type[Post | Comment], batch_size: int) -> int:
+    """
+    Apply buffered votes for up to `batch_size` items, returning the number
+    of intents consumed.
+
+    The item rows are claimed with `SKIP LOCKED`, so flushers running side
+    by side never work on the same item. The claimed items' intents are
+    coalesced to the latest one per user, upserted in one statement and
+    their counters changed with a single `UPDATE`.
+    """
+
+    vote_model, intent_model = VOTE_MODELS[item_model]
+    item_field = item_model._meta.model_name
+    item_attname = f"{item_field}_id"
+
+    pending = intent_model.objects.order_by("pk").values_list(
+        item_attname, flat=True
+    )[: batch_size * 10]
+    item_ids = list(dict.fromkeys(pending))[:batch_size]
+    if not item_ids:
+        return 0
+
+    claimed = list(
+        item_model.objects.filter(pk__in=item_ids)
+        .select_for_update(skip_locked=True)
+        .values_list("pk", flat=True)
+    )
+    if not claimed:
+        return 0
+
+    intents = list(
+        intent_model.objects.filter(**{f"{item_attname}__in": claimed})
+        .order_by("pk")
+        .values_list("pk", "user_id", item_attname, "value")
+    )
+
+    # Later intents replace earlier ones of the same user and item
+    latest = {
+        (user_id, item_id): value for _, user_id, item_id, value in intents
+    }
+    users = {user_id for user_id, _ in latest}
+
+    previous = {
+        (user_id, item_id): value
+        for user_id, item_id, value in vote_model.objects.filter(
+            **{f"{item_attname}__in": claimed, "user_id__in": users}
+        ).values_list("user_id", item_attname, "value")
+    }
+
+    deltas = {}
+    cast = {}
+    upserts = []
+    withdrawn = Q()
+    for (user_id, item_id), value in latest.items():
+        old = previous.get((user_id, item_id), 0)
+        if value == old:
+            continue
+
+        upvotes, downvotes = deltas.get(item_id, (0, 0))
+        up, down = get_vote_deltas(old, value)
+        deltas[item_id] = (upvotes + up, downvotes + down)
+
+        if value:
+            cast[item_id] = cast.get(item_id, 0) + 1
+            upserts.append(
+                vote_model(
+                    **{"user_id": user_id, item_attname: item_id}, value=value
+                )
+            )
+        else:
+            withdrawn |= Q(**{"user_id": user_id, item_attname: item_id})
+
+    if upserts:
+        vote_model.objects.bulk_create(
+            upserts,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=["user", item_field],
+            update_fields=["value", "modified"],
+        )
+    if withdrawn:
+        vote_model.objects.filter(withdrawn).delete()
+
+    add_vote_counts(item_model, deltas)
+    if item_model is Post:
+        for post_id, votes in cast.items():
+            EngagementBucket.record(post_id, votes=votes)
+
+    intent_model.objects.filter(
+        pk__in=[intent[0] for intent in intents]
+    ).delete()
+    return len(intents)
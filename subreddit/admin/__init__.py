@@ -1,4 +1,5 @@
 from .subreddit_admin import (
+    ArchivedBanAdmin,
     BannedUserAdmin,
     ModeratorAdmin,
     SubredditAdmin,
@@ -8,6 +9,7 @@ from .subreddit_admin import (
 
 
 __all__ = (
+    "ArchivedBanAdmin",
     "BannedUserAdmin",
     "ModeratorAdmin",
     "SubredditAdmin",
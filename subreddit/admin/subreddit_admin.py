@@ -1,15 +1,18 @@
 from django.contrib import admin, messages
+from django.db import transaction
 from django.db.models import BooleanField, Case, F, QuerySet, When
 from django.utils.html import format_html
 from django.utils.translation import ngettext
 
 from subreddit.models import (
+    ArchivedBan,
     BannedUser,
     Moderator,
     Subreddit,
     SubredditLink,
     SubredditUser,
 )
+from subreddit.moderation import invalidate_bans
 
 # Register your models here.
 
@@ -75,20 +78,30 @@ class SubredditUserAdmin(admin.ModelAdmin):
             self.message_user(
                 request,
                 ngettext(
-                    singular=f"{updated[0]} user banned",
-                    plural=f"{updated[0]} users banned",
+                    singular=f"{updated} user banned",
+                    plural=f"{updated} users banned",
                     number=updated,
                 ),
                 messages.SUCCESS,
             )
 
-    def _ban_users(self, queryset: QuerySet["SubredditUser"]):
+    @transaction.atomic
+    def _ban_users(self, queryset: QuerySet["SubredditUser"]) -> int:
+        # The moderators join repeats a member once per moderator
+        members = list({obj.pk: obj for obj in queryset}.values())
         banned_users = [
             BannedUser(subreddit=obj.subreddit, user=obj.user)
-            for obj in queryset
+            for obj in members
         ]
         created = BannedUser.objects.bulk_create(banned_users)
-        return queryset.delete()
+        # `bulk_create` sends no signals to invalidate the cached bans
+        for subreddit_id in {ban.subreddit_id for ban in banned_users}:
+            invalidate_bans(subreddit_id)
+        # One by one, so the hooks update `member_count` and the cached
+        # subscriptions, which a queryset `delete` skips
+        for obj in members:
+            obj.delete()
+        return len(members)
 
     is_user_a_moderator.short_description = "Is Moderator?"
     is_user_a_moderator.boolean = True
@@ -160,8 +173,23 @@ class BannedUserAdmin(admin.ModelAdmin):
         )
 
 
+class ArchivedBanAdmin(admin.ModelAdmin):
+    list_display = (
+        "user",
+        "subreddit",
+        "description",
+        "banned_on",
+        "banned_until",
+        "banned_by",
+    )
+    list_filter = ("subreddit", "banned_until")
+    search_fields = ("description",)
+    search_help_text = "Search via Description"
+
+
 admin.site.register(Subreddit, SubredditAdmin)
 admin.site.register(SubredditUser, SubredditUserAdmin)
 admin.site.register(Moderator, ModeratorAdmin)
 admin.site.register(SubredditLink, SubredditLinkAdmin)
 admin.site.register(BannedUser, BannedUserAdmin)
+admin.site.register(ArchivedBan, ArchivedBanAdmin)
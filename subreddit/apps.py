@@ -5,3 +5,6 @@ class SubredditConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "subreddit"
     verbose_name = "Subreddit"
+
+    def ready(self):
+        from subreddit import checks, signals  # noqa: F401
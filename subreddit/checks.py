@@ -0,0 +1,9 @@
+from core.checks import register_shared_cache_check
+
+# Moderator and ban changes are invalidated in the shared cache, each process
+# keeps only a short lived local copy on top of it
+register_shared_cache_check("subreddit", 1, "the moderators and bans")
+
+# Joining or leaving drops the user's subscriptions in the process handling
+# the request only, unless the cache is shared
+register_shared_cache_check("subreddit", 2, "the subscriptions")
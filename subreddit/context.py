@@ -0,0 +1,50 @@
+from dataclasses import dataclass
+
+from subreddit.models import Subreddit
+from subreddit.moderation import is_banned, is_moderator
+from subreddit.subscriptions import is_subscribed
+
+# The subreddit of a request is resolved once, from the URL kwarg named by the
+# view's `subreddit_url_kwarg`, together with the requesting user's
+# membership, moderator and ban status. Permissions and views share it.
+
+
+@dataclass(frozen=True)
+class SubredditContext:
+    subreddit: Subreddit | None = None
+    is_member: bool = False
+    is_moderator: bool = False
+    # Banned either permanently or until a moment still to come
+    is_banned: bool = False
+
+
+def load_subreddit_context(name: str, user_id: int | None) -> SubredditContext:
+    """
+    Subreddit in a single query, the user's membership, moderator and ban
+    status from their caches
+    """
+
+    subreddit = Subreddit.objects.filter(name=name).first()
+    if subreddit is None:
+        return SubredditContext()
+
+    return SubredditContext(
+        subreddit=subreddit,
+        is_member=user_id is not None and is_subscribed(user_id, subreddit.pk),
+        is_moderator=is_moderator(subreddit.pk, user_id),
+        is_banned=is_banned(subreddit.pk, user_id),
+    )
+
+
+def get_subreddit_context(request, view) -> SubredditContext:
+    """Context of the subreddit in the URL, loaded once per request"""
+
+    url_kwarg = getattr(view, "subreddit_url_kwarg", "subreddit_name")
+    name = getattr(view, "kwargs", {}).get(url_kwarg)
+    if not name:
+        return SubredditContext()
+
+    contexts = request.__dict__.setdefault("_subreddit_contexts", {})
+    if name not in contexts:
+        contexts[name] = load_subreddit_context(name, request.user.id)
+    return contexts[name]
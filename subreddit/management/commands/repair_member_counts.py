@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from subreddit.models import Subreddit, SubredditUser
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute `Subreddit.member_count` and fix the rows that drifted, "
+        "i.e. after members were deleted without their hooks"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--subreddit",
+            dest="subreddits",
+            action="append",
+            help="Name of a subreddit to repair (repeatable), defaults to all",
+        )
+        parser.add_argument("--chunk-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        subreddits = Subreddit.objects.order_by("pk")
+        if options["subreddits"]:
+            subreddits = subreddits.filter(name__in=options["subreddits"])
+
+        subreddits = subreddits.annotate(
+            actual=Count("joined_users")
+        ).values_list("pk", "member_count", "actual")
+
+        repaired = 0
+        for subreddit_id, member_count, actual in subreddits.iterator(
+            chunk_size=options["chunk_size"]
+        ):
+            if member_count != actual:
+                repaired += self.repair_subreddit(subreddit_id)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Repaired {repaired} subreddit(s)")
+        )
+
+    @transaction.atomic
+    def repair_subreddit(self, subreddit_id: int) -> int:
+        """Recount under the row's lock, members may join meanwhile"""
+
+        subreddit = (
+            Subreddit.objects.select_for_update()
+            .only("member_count")
+            .get(pk=subreddit_id)
+        )
+        actual = SubredditUser.objects.filter(subreddit_id=subreddit_id).count()
+        if subreddit.member_count == actual:
+            return 0
+        Subreddit.objects.filter(pk=subreddit_id).update(member_count=actual)
+        return 1
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from subreddit.moderation import archive_expired_bans
+
+
+class Command(BaseCommand):
+    help = (
+        "Archive expired subreddit bans, keeping `BannedUser` down to the "
+        "active ones. Runs as a scheduler every `--interval` seconds unless "
+        "`--once` is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, default=300)
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Bans archived per transaction",
+        )
+        parser.add_argument("--once", action="store_true")
+
+    def handle(self, *args, **options):
+        while True:
+            archived = 0
+            while bans := archive_expired_bans(options["batch_size"]):
+                archived += bans
+
+            if options["verbosity"] > 1 or options["once"]:
+                self.stdout.write(
+                    self.style.SUCCESS(f"Archived {archived} expired ban(s)")
+                )
+
+            if options["once"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.11 on 2026-10-18 19:37
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_member_count(apps, schema_editor):
+    Subreddit = apps.get_model("subreddit", "Subreddit")
+    SubredditUser = apps.get_model("subreddit", "SubredditUser")
+
+    Subreddit.objects.update(
+        member_count=Coalesce(
+            Subquery(
+                SubredditUser.objects.filter(subreddit=OuterRef("pk"))
+                .order_by()
+                .values("subreddit")
+                .annotate(count=Count("pk"))
+                .values("count")[:1]
+            ),
+            0,
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("subreddit", "0008_banneduser"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="subreddit",
+            name="member_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(
+            code=backfill_member_count,
+            reverse_code=migrations.RunPython.noop,
+        ),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 4.2.11 on 2026-10-18 19:49
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import model_utils.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("subreddit", "0009_subreddit_member_count"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedBan",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created",
+                    model_utils.fields.AutoCreatedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="created",
+                    ),
+                ),
+                (
+                    "modified",
+                    model_utils.fields.AutoLastModifiedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="modified",
+                    ),
+                ),
+                ("description", models.TextField(blank=True, null=True)),
+                ("banned_on", models.DateTimeField()),
+                ("banned_until", models.DateTimeField()),
+            ],
+            options={
+                "verbose_name": "Archived Ban",
+                "verbose_name_plural": "Archived Bans",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="banneduser",
+            index=models.Index(
+                fields=["subreddit", "user", "banned_until"],
+                name="subreddit_ban_active_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="banneduser",
+            index=models.Index(
+                condition=models.Q(("banned_until__isnull", False)),
+                fields=["banned_until"],
+                name="subreddit_ban_until_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedban",
+            name="banned_by",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="subreddit.moderator",
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedban",
+            name="subreddit",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="archived_bans",
+                to="subreddit.subreddit",
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedban",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="archived_bans",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+    ]
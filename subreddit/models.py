@@ -1,13 +1,22 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 
+from django.core.cache import cache
 from django.db import models, transaction
+from django.db.models import F, Q
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from ckeditor.fields import RichTextField
-from django_lifecycle import AFTER_CREATE, LifecycleModelMixin, hook
+from django_lifecycle import (
+    AFTER_CREATE,
+    AFTER_DELETE,
+    BEFORE_DELETE,
+    LifecycleModelMixin,
+    hook,
+)
 
-from common.constants import FieldConstants
+from common.constants import FieldConstants, SubscriptionConstants
 from common.utils import (
     get_default_subreddit_cover_path,
     get_default_subreddit_image_path,
@@ -56,6 +65,8 @@ class Subreddit(LifecycleModelMixin, BaseModel):
         default=get_default_subreddit_cover_path,
     )
 
+    member_count = models.IntegerField(default=0, editable=False)
+
     # flairs = models.ManyToManyField(
     #     to=Flair, verbose_name="Flairs", related_name="subreddits",
     # )
@@ -84,7 +95,7 @@ class Subreddit(LifecycleModelMixin, BaseModel):
             Moderator.objects.create(user=self.owner, subreddit=self)
 
 
-class SubredditUser(BaseModel):
+class SubredditUser(LifecycleModelMixin, BaseModel):
     user = models.ForeignKey(
         to=User, on_delete=models.CASCADE, related_name="joined_subreddits"
     )
@@ -100,11 +111,32 @@ class SubredditUser(BaseModel):
     def __str__(self) -> str:
         return f"{self.user} - {self.subreddit}"
 
+    @hook(hook=AFTER_CREATE)
+    def increment_member_count(self) -> None:
+        Subreddit.objects.filter(pk=self.subreddit_id).update(
+            member_count=F("member_count") + 1
+        )
+
+    @hook(hook=BEFORE_DELETE)
+    def decrement_member_count(self) -> None:
+        Subreddit.objects.filter(pk=self.subreddit_id).update(
+            member_count=F("member_count") - 1
+        )
+
+    @hook(hook=AFTER_CREATE)
+    @hook(hook=AFTER_DELETE)
+    def invalidate_subscriptions(self) -> None:
+        """Drop the user's cached subscriptions once this commits"""
+
+        key = SubscriptionConstants.SUBSCRIPTIONS_CACHE_KEY.format(self.user_id)
+        transaction.on_commit(lambda: cache.delete(key))
+
     @property
     def is_moderator(self) -> bool:
-        return self.user.id in self.subreddit.moderators.select_related(
-            "user"
-        ).values_list("user__id", flat=True)
+        # Imported here, the moderation caches are built on these models
+        from subreddit.moderation import is_moderator
+
+        return is_moderator(self.subreddit_id, self.user_id)
 
 
 class Moderator(BaseModel):
@@ -150,6 +182,18 @@ class SubredditLink(BaseModel):
         return f"{self.subreddit.name} || {self.name} - {self.url}"
 
 
+class BannedUserQuerySet(models.QuerySet):
+    def active(self):
+        """Bans without an end (permanent) or ending in the future"""
+
+        return self.filter(
+            Q(banned_until__isnull=True) | Q(banned_until__gt=timezone.now())
+        )
+
+    def expired(self):
+        return self.filter(banned_until__lte=timezone.now())
+
+
 class BannedUser(BaseModel):
     """Users banned from Subreddits by moderators"""
 
@@ -170,10 +214,25 @@ class BannedUser(BaseModel):
         null=True,
     )
 
+    objects = BannedUserQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Banned User")
         verbose_name_plural = _("Banned Users")
         unique_together = ("user", "subreddit")
+        indexes = [
+            # Active ban lookups, NULL `banned_until` is a permanent ban
+            models.Index(
+                fields=["subreddit", "user", "banned_until"],
+                name="subreddit_ban_active_idx",
+            ),
+            # Expired bans for `sweep_expired_bans`
+            models.Index(
+                fields=["banned_until"],
+                name="subreddit_ban_until_idx",
+                condition=Q(banned_until__isnull=False),
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.user} - {self.subreddit}"
@@ -181,3 +240,28 @@ class BannedUser(BaseModel):
     @property
     def is_perma_banned(self):
         return self.banned_until is None
+
+
+class ArchivedBan(BaseModel):
+    """Expired bans, moved out of `BannedUser` by `sweep_expired_bans`"""
+
+    user = models.ForeignKey(
+        to=User, on_delete=models.CASCADE, related_name="archived_bans"
+    )
+    subreddit = models.ForeignKey(
+        to=Subreddit, on_delete=models.CASCADE, related_name="archived_bans"
+    )
+    description = models.TextField(blank=True, null=True)
+    banned_on = models.DateTimeField()
+    banned_until = models.DateTimeField()
+    banned_by = models.ForeignKey(
+        to=Moderator,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        blank=True,
+        null=True,
+    )
+
+    class Meta:
+        verbose_name = _("Archived Ban")
+        verbose_name_plural = _("Archived Bans")
@@ -0,0 +1,101 @@
+from datetime import datetime
+
+from django.db import transaction
+from django.utils import timezone
+
+from common.constants import ModerationConstants
+from core.cache import TwoLevelCache
+from subreddit.models import ArchivedBan, BannedUser, Moderator
+
+# Moderator ids and bans of each subreddit, cached in process and in the
+# shared cache. `subreddit.signals` drops them when a `Moderator` or
+# `BannedUser` is saved or deleted.
+
+
+def load_moderators(subreddit_id: int) -> frozenset[int]:
+    return frozenset(
+        Moderator.objects.filter(subreddit_id=subreddit_id).values_list(
+            "user_id", flat=True
+        )
+    )
+
+
+def load_bans(subreddit_id: int) -> dict[int, datetime | None]:
+    return dict(
+        BannedUser.objects.filter(subreddit_id=subreddit_id)
+        .active()
+        .values_list("user_id", "banned_until")
+    )
+
+
+moderators_cache = TwoLevelCache(
+    key_format=ModerationConstants.MODERATORS_CACHE_KEY,
+    load=load_moderators,
+    maxsize=ModerationConstants.LOCAL_CACHE_SIZE,
+    ttl=ModerationConstants.LOCAL_CACHE_TTL,
+    timeout=ModerationConstants.CACHE_TIMEOUT,
+)
+bans_cache = TwoLevelCache(
+    key_format=ModerationConstants.BANS_CACHE_KEY,
+    load=load_bans,
+    maxsize=ModerationConstants.LOCAL_CACHE_SIZE,
+    ttl=ModerationConstants.LOCAL_CACHE_TTL,
+    timeout=ModerationConstants.CACHE_TIMEOUT,
+)
+
+
+def is_moderator(subreddit_id: int, user_id: int | None) -> bool:
+    return user_id in moderators_cache.get(subreddit_id)
+
+
+def is_banned(subreddit_id: int, user_id: int | None) -> bool:
+    """Banned either permanently or until a moment still to come"""
+
+    bans = bans_cache.get(subreddit_id)
+    if user_id not in bans:
+        return False
+    banned_until = bans[user_id]
+    return banned_until is None or banned_until > timezone.now()
+
+
+def invalidate_moderators(subreddit_id: int) -> None:
+    transaction.on_commit(lambda: moderators_cache.delete(subreddit_id))
+
+
+def invalidate_bans(subreddit_id: int) -> None:
+    transaction.on_commit(lambda: bans_cache.delete(subreddit_id))
+
+
+@transaction.atomic
+def archive_expired_bans(batch_size: int) -> int:
+    """
+    Move the oldest expired bans to `ArchivedBan`. Bans are claimed with
+    `SKIP LOCKED` so several sweepers can run at once.
+    """
+
+    bans = list(
+        BannedUser.objects.expired()
+        .order_by("banned_until")
+        .select_for_update(skip_locked=True)[:batch_size]
+    )
+    if not bans:
+        return 0
+
+    ArchivedBan.objects.bulk_create(
+        [
+            ArchivedBan(
+                user_id=ban.user_id,
+                subreddit_id=ban.subreddit_id,
+                description=ban.description,
+                banned_on=ban.created,
+                banned_until=ban.banned_until,
+                banned_by_id=ban.banned_by_id,
+            )
+            for ban in bans
+        ]
+    )
+    # A single delete, but with `post_delete` receivers connected Django
+    # still sends the signal for every ban, which drops it from the cache.
+    # A raw delete would skip them and leave the bans cached.
+    BannedUser.objects.filter(pk__in=[ban.pk for ban in bans]).delete()
+    return len(bans)
@@ -5,6 +5,7 @@ from rest_framework.validators import UniqueTogetherValidator
 from common.fields import CurrentModeratorDefault, UserSlugRelatedField
 
 from common.mixins import SerializerCreateUpdateOnlyMixin
+from core.preload import preload
 from core.serializers import DynamicFieldsModelSerializer
 from subreddit.models import (
     BannedUser,
@@ -67,12 +68,11 @@ class SubredditDetailSerializer(DynamicFieldsModelSerializer):
 
     @extend_schema_field(OpenApiTypes.OBJECT)
     def get_moderators(self, instance: Subreddit):
-        return ModeratorSerializer(
-            instance.moderators.all().only("user"),
-            many=True,
-            read_only=True,
-            fields=("username",),
-        ).data
+        serializer = ModeratorSerializer(
+            many=True, read_only=True, fields=("username",)
+        )
+        serializer.instance = preload(instance.moderators.all(), serializer)
+        return serializer.data
 
     def get_joined(self, instance: Subreddit) -> bool:
         user = self.context.get("request").user
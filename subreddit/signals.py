@@ -0,0 +1,18 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from subreddit.models import BannedUser, Moderator
+from subreddit.moderation import invalidate_bans, invalidate_moderators
+
+
+# Signals rather than lifecycle hooks, so cascading deletes invalidate too
+@receiver(post_save, sender=Moderator)
+@receiver(post_delete, sender=Moderator)
+def moderator_changed(sender, instance: Moderator, **kwargs) -> None:
+    invalidate_moderators(instance.subreddit_id)
+
+
+@receiver(post_save, sender=BannedUser)
+@receiver(post_delete, sender=BannedUser)
+def ban_changed(sender, instance: BannedUser, **kwargs) -> None:
+    invalidate_bans(instance.subreddit_id)
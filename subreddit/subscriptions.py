@@ -0,0 +1,37 @@
+from array import array
+from bisect import bisect_left
+
+from django.core.cache import cache
+
+from common.constants import SubscriptionConstants
+from subreddit.models import SubredditUser
+
+# The ids of the subreddits a user joined are cached as a sorted `array` of
+# 64 bit ints, so a feed reads them in one cache hit and a membership check
+# is a binary search. `SubredditUser` hooks drop the entry on join and leave.
+
+
+def get_subscriptions(user_id: int) -> array:
+    """Sorted ids of the subreddits the user joined"""
+
+    key = SubscriptionConstants.SUBSCRIPTIONS_CACHE_KEY.format(user_id)
+    subscriptions = cache.get(key)
+    if subscriptions is None:
+        subscriptions = array(
+            "q",
+            SubredditUser.objects.filter(user_id=user_id)
+            .order_by("subreddit_id")
+            .values_list("subreddit_id", flat=True),
+        )
+        cache.set(
+            key,
+            subscriptions,
+            timeout=SubscriptionConstants.SUBSCRIPTIONS_TIMEOUT,
+        )
+    return subscriptions
+
+
+def is_subscribed(user_id: int, subreddit_id: int) -> bool:
+    subscriptions = get_subscriptions(user_id)
+    index = bisect_left(subscriptions, subreddit_id)
+    return index < len(subscriptions) and subscriptions[index] == subreddit_id
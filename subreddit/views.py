@@ -1,6 +1,7 @@
 from rest_framework import mixins
 from rest_framework.decorators import action
 from rest_framework.generics import get_object_or_404
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST
 from rest_framework.viewsets import GenericViewSet, ModelViewSet
@@ -9,14 +10,22 @@ from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 
-from common.mixins import PermissionActionClassMixin, SerializerActionClassMixin
+from common.mixins import (
+    PermissionActionClassMixin,
+    PreloadSerializerMixin,
+    SerializerActionClassMixin,
+    SparseFieldsMixin,
+    SubredditContextMixin,
+    ValuesResponseMixin,
+)
 from common.permissions import (
     IsSubredditOwnerOrModerator,
     IsUserBanned,
     IsUserTheOwner,
 )
+from post.feeds import backfill_timeline
 from subreddit.filters import SubredditFilterSet
-from subreddit.models import Subreddit, SubredditLink
+from subreddit.models import Subreddit, SubredditLink, SubredditUser
 from subreddit.serializers import (
     BannedUserDetailSerializer,
     BannedUserSerializer,
@@ -33,7 +42,13 @@ from subreddit.serializers import (
 
 @extend_schema(tags=["Subreddit"])
 class SubredditViewSet(
-    PermissionActionClassMixin, SerializerActionClassMixin, ModelViewSet
+    PermissionActionClassMixin,
+    SerializerActionClassMixin,
+    SubredditContextMixin,
+    PreloadSerializerMixin,
+    SparseFieldsMixin,
+    ValuesResponseMixin,
+    ModelViewSet,
 ):
     """Subreddit ViewSet"""
 
@@ -51,11 +66,13 @@ class SubredditViewSet(
         "partial_update": ((IsUserTheOwner | IsSubredditOwnerOrModerator),),
         "destroy": (IsUserTheOwner,),
         "join": (IsUserBanned,),
+        "leave": (IsAuthenticated,),
         "bans": (IsSubredditOwnerOrModerator,),
         "ban": (IsSubredditOwnerOrModerator,),
         "unban": (IsSubredditOwnerOrModerator,),
     }
     lookup_field = "name"
+    subreddit_url_kwarg = "name"
     filter_backends = [DjangoFilterBackend]
     filterset_class = SubredditFilterSet
     search_fields = ["name"]
@@ -72,17 +89,21 @@ class SubredditViewSet(
             queryset = queryset.prefetch_related("banned_users")
         return queryset
 
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.values_response(queryset)
+
     @action(methods=["POST"], detail=True)
     def join(self, request, *args, **kwargs):
         """Allow a user to join subreddit"""
 
         msg = "You already joined the subreddit"
-        serializer = self.get_serializer(
-            data={"subreddit": self.get_object().id}
-        )
+        subreddit: Subreddit = self.get_subreddit()
+        serializer = self.get_serializer(data={"subreddit": subreddit.id})
         data = {"message": "Joined Subreddit"}
         if serializer.is_valid():
             serializer.save()
+            backfill_timeline(request.user.id, [subreddit.id])
         else:
             if msg in serializer.errors.get("non_field_errors", []):
                 data = {"message": msg}
@@ -91,6 +112,30 @@ class SubredditViewSet(
 
         return Response(data=data, status=HTTP_200_OK)
 
+    @extend_schema(request=None)
+    @action(methods=["POST"], detail=True)
+    def leave(self, request, *args, **kwargs):
+        """Allow a user to leave subreddit"""
+
+        context = self.get_subreddit_context()
+        subreddit = self.get_subreddit()
+        if subreddit.owner_id == request.user.id:
+            return Response(
+                data={"message": "Owner cannot leave the subreddit"},
+                status=HTTP_400_BAD_REQUEST,
+            )
+
+        if not context.is_member:
+            return Response(
+                data={"message": "You are not a member of the subreddit"},
+                status=HTTP_400_BAD_REQUEST,
+            )
+
+        SubredditUser.objects.get(
+            user=request.user, subreddit=subreddit
+        ).delete()
+        return Response(data={"message": "Left Subreddit"}, status=HTTP_200_OK)
+
     @action(methods=["GET"], detail=True)
     def bans(self, request, *args, **kwargs):
         """Allow moderators to see all banned user"""
@@ -158,6 +203,9 @@ class SubredditViewSet(
     ],
 )
 class SubredditLinkViewSet(
+    SubredditContextMixin,
+    PreloadSerializerMixin,
+    SparseFieldsMixin,
     mixins.CreateModelMixin,
     mixins.UpdateModelMixin,
     mixins.ListModelMixin,
@@ -170,7 +218,7 @@ class SubredditLinkViewSet(
 
     def get_queryset(self):
         queryset = SubredditLink.objects.select_related("subreddit").filter(
-            subreddit__name=self.kwargs["subreddit_name"]
+            subreddit=self.get_subreddit()
         )
         return queryset
 
@@ -7,6 +7,7 @@ from rest_framework.authtoken.models import Token
 
 from common.constants import FieldConstants
 from common.utils import get_timedelta
+from core.preload import preload
 from core.serializers import DynamicFieldsModelSerializer
 from users.models import User
 
@@ -55,8 +56,7 @@ class UserDetailSerializer(DynamicFieldsModelSerializer):
     def get_posts(self, instance: User) -> dict:
         from post.serializers.post_serializers import PostListSerializer
 
-        return PostListSerializer(
-            instance=instance.posts.all(),
+        serializer = PostListSerializer(
             many=True,
             read_only=True,
             fields=(
@@ -67,17 +67,20 @@ class UserDetailSerializer(DynamicFieldsModelSerializer):
                 "edited_at",
                 "locked",
             ),
-        ).data
+        )
+        serializer.instance = preload(instance.posts.all(), serializer)
+        return serializer.data
 
     def get_comments(self, instance: User) -> dict:
         from post.serializers.comment_serializers import CommentListSerializer
 
-        return CommentListSerializer(
-            instance=instance.comments.all(),
+        serializer = CommentListSerializer(
             many=True,
             read_only=True,
             fields=("id", "post", "text", "edited_at", "locked"),
-        ).data
+        )
+        serializer.instance = preload(instance.comments.all(), serializer)
+        return serializer.data
 
     class Meta:
         model = User
@@ -8,16 +8,30 @@ from rest_framework.permissions import (
 )
 from rest_framework.response import Response
 from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.viewsets import GenericViewSet
 
 # from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema
 
+from common.choices import FEED_ORDERINGS, FEED_TYPES
 from common.constants import PostType
-from common.mixins import PermissionActionClassMixin, SerializerActionClassMixin
+from common.mixins import (
+    PaginationActionClassMixin,
+    PermissionActionClassMixin,
+    PreloadSerializerMixin,
+    SerializerActionClassMixin,
+    SparseFieldsMixin,
+    ValuesResponseMixin,
+)
 from common.permissions import IsUserTheOwner
+from core.pagination import PAGINATION_CHOICES, KeysetPagination
+from post.feeds import get_home_feed
 from post.models import Post
 from post.serializers.post_serializers import PostListSerializer
+from post.trending import get_popular_page
+from subreddit.models import Subreddit
+from subreddit.subscriptions import get_subscriptions
 
 # from users.filters import UserHomeFeedFilterSet
 from users.models import User
@@ -33,8 +47,12 @@ from users.serializers import (
 
 @extend_schema(tags=["Users"])
 class UserViewSet(
+    PaginationActionClassMixin,
     PermissionActionClassMixin,
     SerializerActionClassMixin,
+    PreloadSerializerMixin,
+    SparseFieldsMixin,
+    ValuesResponseMixin,
     mixins.RetrieveModelMixin,
     mixins.UpdateModelMixin,
     mixins.DestroyModelMixin,
@@ -53,6 +71,7 @@ class UserViewSet(
         "retrieve": UserDetailSerializer,
         "feed": PostListSerializer,
     }
+    pagination_choices = PAGINATION_CHOICES
     permission_classes = (IsUserTheOwner,)
     permission_action_classes = {
         "retrieve": (IsAuthenticatedOrReadOnly,),
@@ -101,9 +120,9 @@ class UserViewSet(
     def feed(self, request, *args, **kwargs):
         feed_type = request.query_params.get("feed_type", "subscribed")
         post_type = request.query_params.get("post_type", None)
-        ordering = request.query_params.get("ordering", "-created")
+        ordering = request.query_params.get("ordering", FEED_ORDERINGS.new)
 
-        if feed_type not in ["subscribed", "all"]:
+        if feed_type not in FEED_TYPES:
             return Response(
                 data={"message": "`feed_type` must be a valid choice."},
                 status=HTTP_400_BAD_REQUEST,
@@ -115,45 +134,91 @@ class UserViewSet(
                 status=HTTP_400_BAD_REQUEST,
             )
 
-        # if (
-        #     ordering
-        #     not in [
-        #         "new",
-        #         "best",
-        #         "hot",
-        #         "rising",
-        #         "controversial",
-        #         "random",
-        #     ]
-        #     and ordering is not None
-        # ):
-        #     return Response(
-        #         data={"message": "`ordering` must be a valid choice."},
-        #         status=HTTP_400_BAD_REQUEST,
-        #     )
+        if ordering not in FEED_ORDERINGS:
+            return Response(
+                data={"message": "`ordering` must be a valid choice."},
+                status=HTTP_400_BAD_REQUEST,
+            )
+
+        if feed_type == FEED_TYPES.popular:
+            return self.popular_feed(request, post_type)
+
+        # The home timeline only pages by cursor, page numbers stay the
+        # default and read the posts below
+        if (
+            feed_type == FEED_TYPES.subscribed
+            and ordering == FEED_ORDERINGS.new
+            and isinstance(self.paginator, KeysetPagination)
+        ):
+            return self.home_feed(request, post_type)
 
         posts = Post.objects.all()
-        if feed_type == "subscribed":
-            subreddits = set(
-                request.user.joined_subreddits.values_list(
-                    "subreddit__id", flat=True
-                )
+        if feed_type == FEED_TYPES.subscribed:
+            posts = posts.filter(
+                subreddit__in=get_subscriptions(request.user.id)
             )
-            posts = posts.filter(subreddit__in=subreddits)
 
         if post_type is not None:
             posts = posts.filter(post_type=post_type)
 
-        # if ordering:
-        #     posts = posts.order_by("-created")
+        return self.values_response(posts.ranked(ordering))
+
+    def home_feed(self, request, post_type: str | None) -> Response:
+        """Newest posts of joined subreddits, read from the user's timeline"""
 
-        page = self.paginate_queryset(posts)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
+        feed = get_home_feed(
+            user=request.user,
+            page_size=self.paginator.get_page_size(request),
+            post_type=post_type,
+        )
+        posts, cursor = feed.get_page(request.query_params.get("cursor"))
+
+        next_url = None
+        if cursor is not None:
+            next_url = replace_query_param(
+                request.build_absolute_uri(), "cursor", cursor
+            )
 
         serializer = self.get_serializer(posts, many=True)
-        return Response(serializer.data, status=HTTP_200_OK)
+        return Response(
+            data={"next": next_url, "results": serializer.data},
+            status=HTTP_200_OK,
+        )
+
+    def popular_feed(self, request, post_type: str | None) -> Response:
+        """Trending posts, globally or of the `subreddit` given by name"""
+
+        subreddit_id = None
+        if name := request.query_params.get("subreddit"):
+            subreddit_id = (
+                Subreddit.objects.filter(name=name)
+                .values_list("id", flat=True)
+                .first()
+            )
+            if subreddit_id is None:
+                return Response(
+                    data={"message": "`subreddit` does not exist."},
+                    status=HTTP_400_BAD_REQUEST,
+                )
+
+        posts, cursor = get_popular_page(
+            page_size=self.paginator.get_page_size(request),
+            subreddit_id=subreddit_id,
+            post_type=post_type,
+            cursor=request.query_params.get("cursor"),
+        )
+
+        next_url = None
+        if cursor is not None:
+            next_url = replace_query_param(
+                request.build_absolute_uri(), "cursor", cursor
+            )
+
+        serializer = self.get_serializer(posts, many=True)
+        return Response(
+            data={"next": next_url, "results": serializer.data},
+            status=HTTP_200_OK,
+        )
 
 
 class UserDetailView(RetrieveAPIView):